@@ -7,7 +7,10 @@ from dotenv import load_dotenv
 
 def check_environment():
     """Check if all required environment variables are set."""
-    required_vars = ["SLACK_BOT_TOKEN", "OPENAI_API_KEY"]
+    required_vars = ["SLACK_SIGNING_SECRET", "OPENAI_API_KEY"]
+    # Either a single-workspace bot token or OAuth app credentials
+    if not (os.getenv("SLACK_CLIENT_ID") and os.getenv("SLACK_CLIENT_SECRET")):
+        required_vars.insert(0, "SLACK_BOT_TOKEN")
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
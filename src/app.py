@@ -4,7 +4,7 @@ Main FastAPI application.
 
 from fastapi import FastAPI
 
-from src.controllers import slack_router
+from src.controllers import slack_router, scheduler_service, slack_clients
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -13,4 +13,17 @@ app = FastAPI(
     version="1.0.0"
 )
 
-app.include_router(slack_router, prefix="/slack")
\ No newline at end of file
+app.include_router(slack_router, prefix="/slack")
+
+@app.on_event("startup")
+async def start_scheduler() -> None:
+    """Start the periodic digest scheduler and the idle Slack client sweep."""
+    scheduler_service.start()
+    slack_clients.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler() -> None:
+    """Stop the periodic digest scheduler and close pooled Slack connections."""
+    await scheduler_service.stop()
+    await slack_clients.stop()
+    await slack_clients.close()
@@ -4,16 +4,72 @@ Configuration settings for the Slack AI Bot application.
 
 from .settings import (
     SLACK_BOT_TOKEN,
+    SLACK_CLIENT_ID,
+    SLACK_CLIENT_SECRET,
+    SLACK_SIGNING_SECRET,
     OPENAI_API_KEY,
     HOST,
     PORT,
     DEBUG,
+    DIGEST_STORE_PATH,
+    DIGEST_CONCURRENCY,
+    DIGEST_PRECOMPUTE_LEAD_MINUTES,
+    DIGEST_MESSAGE_LIMIT,
+    DIGEST_MAX_DELTA_MESSAGES,
+    DIGEST_MAX_AGE_HOURS,
+    CHANNEL_GROUPS_PATH,
+    BATCH_MAX_CHANNELS,
+    BATCH_MAP_CHAR_BUDGET,
+    MESSAGE_BUFFER_SIZE,
+    MESSAGE_BUFFER_CHANNELS,
+    MESSAGE_BUFFER_TTL_SECONDS,
+    SLACK_REDIRECT_URI,
+    SLACK_SCOPES,
+    SLACK_INSTALLATION_DIR,
+    SLACK_OAUTH_STATE_DIR,
+    SLACK_CLIENT_IDLE_SECONDS,
+    SLACK_MAX_CONNECTIONS,
+    SLACK_TEAM_CONCURRENCY,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_SIZE,
+    SUMMARY_INDEX_SIZE,
+    SUMMARY_SIMILARITY_THRESHOLD,
+    SUMMARY_MINHASH_PERMUTATIONS,
+    SUMMARY_MAX_MERGES,
 )
 
 __all__ = [
     "SLACK_BOT_TOKEN",
+    "SLACK_CLIENT_ID",
+    "SLACK_CLIENT_SECRET",
+    "SLACK_SIGNING_SECRET",
     "OPENAI_API_KEY",
     "HOST",
     "PORT",
     "DEBUG",
+    "DIGEST_STORE_PATH",
+    "DIGEST_CONCURRENCY",
+    "DIGEST_PRECOMPUTE_LEAD_MINUTES",
+    "DIGEST_MESSAGE_LIMIT",
+    "DIGEST_MAX_DELTA_MESSAGES",
+    "DIGEST_MAX_AGE_HOURS",
+    "CHANNEL_GROUPS_PATH",
+    "BATCH_MAX_CHANNELS",
+    "BATCH_MAP_CHAR_BUDGET",
+    "MESSAGE_BUFFER_SIZE",
+    "MESSAGE_BUFFER_CHANNELS",
+    "MESSAGE_BUFFER_TTL_SECONDS",
+    "SLACK_REDIRECT_URI",
+    "SLACK_SCOPES",
+    "SLACK_INSTALLATION_DIR",
+    "SLACK_OAUTH_STATE_DIR",
+    "SLACK_CLIENT_IDLE_SECONDS",
+    "SLACK_MAX_CONNECTIONS",
+    "SLACK_TEAM_CONCURRENCY",
+    "USER_CACHE_TTL_SECONDS",
+    "USER_CACHE_SIZE",
+    "SUMMARY_INDEX_SIZE",
+    "SUMMARY_SIMILARITY_THRESHOLD",
+    "SUMMARY_MINHASH_PERMUTATIONS",
+    "SUMMARY_MAX_MERGES",
 ]
@@ -9,9 +9,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Required settings
+# SLACK_BOT_TOKEN serves a single workspace; SLACK_CLIENT_ID/SECRET enable OAuth installs
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-if not SLACK_BOT_TOKEN:
-    raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
+SLACK_CLIENT_ID = os.getenv("SLACK_CLIENT_ID")
+SLACK_CLIENT_SECRET = os.getenv("SLACK_CLIENT_SECRET")
+if not SLACK_BOT_TOKEN and not (SLACK_CLIENT_ID and SLACK_CLIENT_SECRET):
+    raise ValueError("Either SLACK_BOT_TOKEN or SLACK_CLIENT_ID and SLACK_CLIENT_SECRET must be set")
+
+SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
+if not SLACK_SIGNING_SECRET:
+    raise ValueError("SLACK_SIGNING_SECRET environment variable is not set")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
@@ -20,4 +27,42 @@ if not OPENAI_API_KEY:
 # Optional settings with defaults
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "3000"))
-DEBUG = os.getenv("DEBUG", "false").lower() == "true" 
\ No newline at end of file
+DEBUG = os.getenv("DEBUG", "false").lower() == "true" 
+
+# Digest scheduler settings
+DIGEST_STORE_PATH = os.getenv("DIGEST_STORE_PATH", "data/digests.json")
+DIGEST_CONCURRENCY = int(os.getenv("DIGEST_CONCURRENCY", "3"))
+DIGEST_PRECOMPUTE_LEAD_MINUTES = int(os.getenv("DIGEST_PRECOMPUTE_LEAD_MINUTES", "30"))
+DIGEST_MESSAGE_LIMIT = int(os.getenv("DIGEST_MESSAGE_LIMIT", "200"))
+DIGEST_MAX_DELTA_MESSAGES = int(os.getenv("DIGEST_MAX_DELTA_MESSAGES", "30"))
+DIGEST_MAX_AGE_HOURS = int(os.getenv("DIGEST_MAX_AGE_HOURS", "24"))
+
+# Batch summary settings
+CHANNEL_GROUPS_PATH = os.getenv("CHANNEL_GROUPS_PATH", "data/channel_groups.json")
+BATCH_MAX_CHANNELS = int(os.getenv("BATCH_MAX_CHANNELS", "10"))
+BATCH_MAP_CHAR_BUDGET = int(os.getenv("BATCH_MAP_CHAR_BUDGET", "24000"))
+
+# Message buffer settings
+MESSAGE_BUFFER_SIZE = int(os.getenv("MESSAGE_BUFFER_SIZE", "500"))
+MESSAGE_BUFFER_CHANNELS = int(os.getenv("MESSAGE_BUFFER_CHANNELS", "1000"))
+MESSAGE_BUFFER_TTL_SECONDS = int(os.getenv("MESSAGE_BUFFER_TTL_SECONDS", "900"))
+
+# Multi-workspace settings
+SLACK_REDIRECT_URI = os.getenv("SLACK_REDIRECT_URI")
+SLACK_SCOPES = os.getenv(
+    "SLACK_SCOPES",
+    "chat:write,channels:join,channels:read,channels:history,im:write,im:read,im:history,groups:read,groups:write,groups:history,users:read,commands"
+).split(",")
+SLACK_INSTALLATION_DIR = os.getenv("SLACK_INSTALLATION_DIR", "data/installations")
+SLACK_OAUTH_STATE_DIR = os.getenv("SLACK_OAUTH_STATE_DIR", "data/oauth_state")
+SLACK_CLIENT_IDLE_SECONDS = int(os.getenv("SLACK_CLIENT_IDLE_SECONDS", "300"))
+SLACK_MAX_CONNECTIONS = int(os.getenv("SLACK_MAX_CONNECTIONS", "10"))
+SLACK_TEAM_CONCURRENCY = int(os.getenv("SLACK_TEAM_CONCURRENCY", "4"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "3600"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+# Summary reuse settings
+SUMMARY_INDEX_SIZE = int(os.getenv("SUMMARY_INDEX_SIZE", "256"))
+SUMMARY_SIMILARITY_THRESHOLD = float(os.getenv("SUMMARY_SIMILARITY_THRESHOLD", "0.8"))
+SUMMARY_MINHASH_PERMUTATIONS = int(os.getenv("SUMMARY_MINHASH_PERMUTATIONS", "64"))
+SUMMARY_MAX_MERGES = int(os.getenv("SUMMARY_MAX_MERGES", "5"))
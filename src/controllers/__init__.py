@@ -2,8 +2,10 @@
 Controller layer implementations for the Slack AI Bot application.
 """
 
-from .slack_controller import router as slack_router
+from .slack_controller import router as slack_router, scheduler_service, slack_clients
 
 __all__ = [
     "slack_router",
+    "scheduler_service",
+    "slack_clients",
 ]
@@ -2,38 +2,237 @@
 Controller layer for handling Slack event routes.
 """
 
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Union
 from urllib.parse import parse_qs
+import os
+import json
+from datetime import timedelta
 import asyncio
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
+from slack_sdk.errors import SlackApiError
+from slack_sdk.oauth import AuthorizeUrlGenerator
+from slack_sdk.oauth.installation_store import FileInstallationStore, Installation
+from slack_sdk.oauth.state_store import FileOAuthStateStore
+from slack_sdk.signature import SignatureVerifier
+from slack_sdk.web.async_client import AsyncWebClient
 
+from src.config import (
+    DEBUG,
+    SLACK_BOT_TOKEN,
+    SLACK_CLIENT_ID,
+    SLACK_CLIENT_SECRET,
+    SLACK_SIGNING_SECRET,
+    SLACK_REDIRECT_URI,
+    SLACK_SCOPES,
+    SLACK_INSTALLATION_DIR,
+    SLACK_OAUTH_STATE_DIR,
+    SLACK_CLIENT_IDLE_SECONDS,
+    SLACK_MAX_CONNECTIONS,
+    SLACK_TEAM_CONCURRENCY,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_SIZE,
+    SUMMARY_INDEX_SIZE,
+    SUMMARY_SIMILARITY_THRESHOLD,
+    SUMMARY_MINHASH_PERMUTATIONS,
+    SUMMARY_MAX_MERGES,
+    DIGEST_STORE_PATH,
+    DIGEST_CONCURRENCY,
+    DIGEST_PRECOMPUTE_LEAD_MINUTES,
+    DIGEST_MESSAGE_LIMIT,
+    DIGEST_MAX_DELTA_MESSAGES,
+    DIGEST_MAX_AGE_HOURS,
+    CHANNEL_GROUPS_PATH,
+    BATCH_MAX_CHANNELS,
+    BATCH_MAP_CHAR_BUDGET,
+    MESSAGE_BUFFER_SIZE,
+    MESSAGE_BUFFER_CHANNELS,
+    MESSAGE_BUFFER_TTL_SECONDS,
+)
 from src.repositories.slack_repository import SlackRepository
+from src.repositories.digest_repository import DigestRepository
+from src.repositories.channel_group_repository import ChannelGroupRepository
+from src.repositories.message_buffer_repository import MessageBufferRepository
+from src.repositories.slack_client_registry import SlackClientRegistry
+from src.repositories.summary_index_repository import SummaryIndexRepository
+from src.models.slack_models import SlackEventWrapper
 from src.services.slack_service import SlackService
 from src.services.openai_service import OpenAIService
+from src.services.digest_service import DigestService
+from src.services.scheduler_service import SchedulerService
+from src.services.summary_cache_service import SummaryCacheService
+from src.utilities.slack_utilities import parse_schedule_time, parse_channel_references, is_duplicate_event
 
 router = APIRouter()
 
-slack_repository = SlackRepository()
+oauth_enabled = bool(SLACK_CLIENT_ID and SLACK_CLIENT_SECRET)
+signature_verifier = SignatureVerifier(SLACK_SIGNING_SECRET)
+installation_store = FileInstallationStore(base_dir=SLACK_INSTALLATION_DIR, client_id=SLACK_CLIENT_ID)
+oauth_state_store = FileOAuthStateStore(
+    expiration_seconds=600,
+    base_dir=SLACK_OAUTH_STATE_DIR,
+    client_id=SLACK_CLIENT_ID
+)
+slack_clients = SlackClientRegistry(
+    installation_store if oauth_enabled else None,
+    default_token=SLACK_BOT_TOKEN,
+    idle_timeout=SLACK_CLIENT_IDLE_SECONDS,
+    max_connections=SLACK_MAX_CONNECTIONS,
+    max_concurrent_calls=SLACK_TEAM_CONCURRENCY,
+    team_store_path=os.path.join(SLACK_INSTALLATION_DIR, "teams.json")
+)
+message_buffers = MessageBufferRepository(MESSAGE_BUFFER_SIZE, MESSAGE_BUFFER_CHANNELS, MESSAGE_BUFFER_TTL_SECONDS)
+slack_repository = SlackRepository(
+    slack_clients,
+    message_buffers,
+    user_cache_ttl=USER_CACHE_TTL_SECONDS,
+    user_cache_size=USER_CACHE_SIZE
+)
 openai_service = OpenAIService()
-slack_service = SlackService(slack_repository, openai_service)
+digest_service = DigestService(
+    DigestRepository(DIGEST_STORE_PATH),
+    slack_repository,
+    openai_service,
+    message_limit=DIGEST_MESSAGE_LIMIT,
+    max_delta_messages=DIGEST_MAX_DELTA_MESSAGES,
+    max_age=timedelta(hours=DIGEST_MAX_AGE_HOURS)
+)
+summary_cache_service = SummaryCacheService(
+    SummaryIndexRepository(SUMMARY_INDEX_SIZE),
+    slack_repository,
+    openai_service,
+    threshold=SUMMARY_SIMILARITY_THRESHOLD,
+    num_perm=SUMMARY_MINHASH_PERMUTATIONS,
+    max_merges=SUMMARY_MAX_MERGES
+)
+slack_service = SlackService(
+    slack_repository,
+    openai_service,
+    digest_service,
+    max_batch_channels=BATCH_MAX_CHANNELS,
+    batch_char_budget=BATCH_MAP_CHAR_BUDGET,
+    summary_cache_service=summary_cache_service
+)
+channel_group_repository = ChannelGroupRepository(CHANNEL_GROUPS_PATH)
+scheduler_service = SchedulerService(
+    digest_service,
+    slack_service,
+    concurrency=DIGEST_CONCURRENCY,
+    precompute_lead=timedelta(minutes=DIGEST_PRECOMPUTE_LEAD_MINUTES)
+)
+
+async def read_verified_body(request: Request) -> bytes:
+    """Return the raw request body after checking Slack's request signature."""
+    body = await request.body()
+    if not signature_verifier.is_valid_request(body, dict(request.headers)):
+        raise HTTPException(status_code=401, detail="Invalid Slack request signature.")
+    return body
+
+@router.get("/install", response_model=None)
+async def handle_install() -> RedirectResponse:
+    """Redirect to Slack's OAuth consent screen to install the app in a workspace."""
+    if not oauth_enabled:
+        raise HTTPException(status_code=404, detail="OAuth installs are not configured.")
+
+    state = await oauth_state_store.async_issue()
+    url = AuthorizeUrlGenerator(
+        client_id=SLACK_CLIENT_ID,
+        redirect_uri=SLACK_REDIRECT_URI,
+        scopes=SLACK_SCOPES
+    ).generate(state)
+    return RedirectResponse(url)
+
+@router.get("/oauth_redirect", response_model=None)
+async def handle_oauth_redirect(code: Optional[str] = None, state: Optional[str] = None) -> HTMLResponse:
+    """Complete an OAuth install and store the workspace's bot token."""
+    if not oauth_enabled:
+        raise HTTPException(status_code=404, detail="OAuth installs are not configured.")
+    if not code or not state or not await oauth_state_store.async_consume(state):
+        raise HTTPException(status_code=400, detail="Invalid or expired OAuth state.")
+
+    try:
+        response = await AsyncWebClient().oauth_v2_access(
+            client_id=SLACK_CLIENT_ID,
+            client_secret=SLACK_CLIENT_SECRET,
+            code=code,
+            redirect_uri=SLACK_REDIRECT_URI
+        )
+        # oauth.v2.access only returns the bot's user ID, the bot ID comes from auth.test
+        bot_auth = await AsyncWebClient(token=response.get("access_token")).auth_test()
+    except SlackApiError as e:
+        print(f"Error completing OAuth install: {e.response['error']}")
+        raise HTTPException(status_code=400, detail=f"Failed to install app: {e.response['error']}")
+
+    team = response.get("team") or {}
+    enterprise = response.get("enterprise") or {}
+    installation = Installation(
+        app_id=response.get("app_id"),
+        enterprise_id=enterprise.get("id"),
+        enterprise_name=enterprise.get("name"),
+        team_id=team.get("id"),
+        team_name=team.get("name"),
+        bot_token=response.get("access_token"),
+        bot_id=bot_auth.get("bot_id"),
+        bot_user_id=response.get("bot_user_id"),
+        bot_scopes=response.get("scope"),
+        user_id=(response.get("authed_user") or {}).get("id"),
+        token_type=response.get("token_type"),
+        is_enterprise_install=response.get("is_enterprise_install", False)
+    )
+    await installation_store.async_save(installation)
+    # A reinstall may have issued a new token, so drop any cached client for the team
+    if installation.is_enterprise_install:
+        await slack_clients.invalidate_enterprise(installation.enterprise_id)
+    else:
+        await slack_clients.register_team(installation.team_id, installation.enterprise_id, False)
+        await slack_clients.invalidate(installation.team_id)
+
+    workspace = installation.team_name or installation.enterprise_name or installation.team_id
+    return HTMLResponse(f"Slack AI Bot installed in {workspace}.")
 
 @router.post("/events", response_model=None)
 async def handle_slack_events(request: Request) -> Union[Dict[str, Any], JSONResponse]:
     """Handle incoming Slack events."""
-    # Get the raw body first to debug
-    raw_data = await request.json()
+    raw_data = json.loads(await read_verified_body(request))
     event_type = raw_data.get("type")
 
-    print(f"Received event type: {event_type}")
-    print(f"Raw data: {raw_data}")
+    if DEBUG:
+        # Every message in every channel arrives here, so per-event logs are only written when debugging
+        print(f"Received event type: {event_type}")
+        print(f"Raw data: {raw_data}")
     
     match event_type:
         case "url_verification":
             return {
                 "challenge": raw_data.get("challenge")
             }
+        case "event_callback":
+            wrapper = SlackEventWrapper(**raw_data)
+            if is_duplicate_event(wrapper.event_id):
+                return {"ok": True}
+
+            authorization = (wrapper.authorizations or [{}])[0]
+            enterprise_id = wrapper.enterprise_id or authorization.get("enterprise_id")
+            is_enterprise_install = bool(authorization.get("is_enterprise_install"))
+            await slack_clients.register_team(wrapper.team_id, enterprise_id, is_enterprise_install)
+
+            match wrapper.event.type:
+                case "message":
+                    message_buffers.add_event(wrapper.team_id, wrapper.event)
+                case "app_uninstalled" | "tokens_revoked":
+                    # Org-wide installs are stored per enterprise rather than per team
+                    installation_team_id = None if is_enterprise_install else wrapper.team_id
+                    await installation_store.async_delete_bot(enterprise_id=enterprise_id, team_id=installation_team_id)
+                    await installation_store.async_delete_installation(
+                        enterprise_id=enterprise_id,
+                        team_id=installation_team_id
+                    )
+                    if is_enterprise_install:
+                        await slack_clients.invalidate_enterprise(enterprise_id)
+                    else:
+                        await slack_clients.invalidate(wrapper.team_id)
+            return {"ok": True}
         case _:
             raise Exception(f"Unhandled event type: {event_type}")
 
@@ -41,7 +240,7 @@ async def handle_slack_events(request: Request) -> Union[Dict[str, Any], JSONRes
 async def handle_slack_commands(request: Request) -> Union[Dict[str, Any], JSONResponse]:
     """Handle incoming Slack commands."""
 
-    body = await request.body()
+    body = await read_verified_body(request)
 
     # Parse form data
     form_data = parse_qs(body.decode())
@@ -49,6 +248,9 @@ async def handle_slack_commands(request: Request) -> Union[Dict[str, Any], JSONR
     channel_id = form_data.get("channel_id", [None])[0]
     text = form_data.get("text", [""])[0]
     user_id = form_data.get("user_id", [None])[0]
+    team_id = form_data.get("team_id", [None])[0]
+    enterprise_id = form_data.get("enterprise_id", [None])[0]
+    is_enterprise_install = form_data.get("is_enterprise_install", ["false"])[0] == "true"
     
     print(f"Received command: {command} with text: {text} in channel: {channel_id} from user: {user_id}")
     
@@ -58,7 +260,9 @@ async def handle_slack_commands(request: Request) -> Union[Dict[str, Any], JSONR
     
     if not channel_id:
         raise Exception("No channel ID provided")
-    
+
+    await slack_clients.register_team(team_id, enterprise_id, is_enterprise_install)
+
     match command:
         case "/summarize":
             response_url = form_data.get("response_url", [None])[0]
@@ -68,8 +272,23 @@ async def handle_slack_commands(request: Request) -> Union[Dict[str, Any], JSONR
             if not user_id:
                 raise Exception("No user ID provided")
             
-            # Start the summary task
-            asyncio.create_task(slack_service.handle_summary(channel_id, user_id))
+            args = text.split()
+            if args and args[0].lower() == "group":
+                return await handle_group_command(team_id, args[1:])
+
+            if not args:
+                # Start the summary task
+                asyncio.create_task(slack_service.handle_summary(team_id, channel_id, user_id))
+            else:
+                try:
+                    target_ids = await resolve_channel_targets(team_id, text)
+                except ValueError as e:
+                    return {"response_type": "ephemeral", "text": f"⚠️ {str(e)}"}
+
+                if len(target_ids) == 1:
+                    asyncio.create_task(slack_service.handle_summary(team_id, target_ids[0], user_id))
+                else:
+                    asyncio.create_task(slack_service.handle_batch_summary(team_id, target_ids, user_id))
             
             # Send initial response
             return {
@@ -77,5 +296,120 @@ async def handle_slack_commands(request: Request) -> Union[Dict[str, Any], JSONR
                 "text": "⏳ Summarizing messages... I'll send you the summary soon!"
             }
 
+        case "/digest":
+            if not user_id:
+                raise Exception("No user ID provided")
+
+            return await handle_digest_command(team_id, text, channel_id, user_id)
+
         case _:
             raise Exception(f"Unhandled command: {command}")
+
+async def resolve_channel_targets(team_id: Optional[str], text: str) -> List[str]:
+    """Resolve channel mentions, #names and channel group names to channel IDs."""
+    channel_ids, channel_names, words = parse_channel_references(text)
+
+    if channel_names:
+        resolved = await slack_repository.resolve_channel_names(team_id, channel_names)
+        missing = [name for name in channel_names if name not in resolved]
+        if missing:
+            raise ValueError(f"Unknown channel(s): {', '.join('#' + name for name in missing)}")
+        channel_ids.extend(resolved[name] for name in channel_names)
+
+    for word in words:
+        group = channel_group_repository.get_group(team_id, word)
+        if group is None:
+            raise ValueError(f"Unknown channel group: {word}")
+        channel_ids.extend(group)
+
+    if not channel_ids:
+        raise ValueError("No channels given")
+    return list(dict.fromkeys(channel_ids))
+
+async def handle_group_command(team_id: Optional[str], args: List[str]) -> Dict[str, Any]:
+    """Handle `/summarize group save|delete|list` for named channel groups."""
+    action = args[0].lower() if args else "list"
+
+    match action:
+        case "save" if len(args) >= 3:
+            name = args[1]
+            try:
+                channel_ids = await resolve_channel_targets(team_id, " ".join(args[2:]))
+            except ValueError as e:
+                return {"response_type": "ephemeral", "text": f"⚠️ {str(e)}"}
+
+            channel_group_repository.save_group(team_id, name, channel_ids)
+            channels = " ".join(f"<#{channel_id}>" for channel_id in channel_ids)
+            return {"response_type": "ephemeral", "text": f"✅ Saved group `{name}`: {channels}"}
+
+        case "delete" if len(args) == 2:
+            deleted = channel_group_repository.delete_group(team_id, args[1])
+            return {
+                "response_type": "ephemeral",
+                "text": f"✅ Deleted group `{args[1]}`." if deleted else f"Unknown channel group: {args[1]}"
+            }
+
+        case "list":
+            groups = channel_group_repository.list_groups(team_id)
+            if not groups:
+                return {"response_type": "ephemeral", "text": "No channel groups saved."}
+            lines = [
+                f"• `{name}`: " + " ".join(f"<#{channel_id}>" for channel_id in channel_ids)
+                for name, channel_ids in groups.items()
+            ]
+            return {"response_type": "ephemeral", "text": "Channel groups:\n" + "\n".join(lines)}
+
+        case _:
+            return {
+                "response_type": "ephemeral",
+                "text": "Usage: `/summarize group save <name> #a #b`, `/summarize group delete <name>` or `/summarize group list`"
+            }
+
+async def handle_digest_command(team_id: Optional[str], text: str, channel_id: str, user_id: str) -> Dict[str, Any]:
+    """Handle `/digest subscribe [HH:MM]`, `/digest unsubscribe` and `/digest list`."""
+    args = text.split()
+    action = args[0].lower() if args else "list"
+
+    match action:
+        case "subscribe":
+            try:
+                hour, minute = parse_schedule_time(args[1]) if len(args) > 1 else (9, 0)
+            except ValueError as e:
+                return {"response_type": "ephemeral", "text": f"⚠️ {str(e)}"}
+
+            try:
+                await slack_service.join_channel(team_id, channel_id)
+            except SlackApiError as e:
+                # Private channels and DMs cannot be joined; the app has to be invited instead
+                if e.response["error"] != "method_not_supported_for_channel_type":
+                    return {
+                        "response_type": "ephemeral",
+                        "text": f"⚠️ Could not join <#{channel_id}>: {e.response['error']}"
+                    }
+
+            subscription = digest_service.subscribe(team_id, channel_id, user_id, hour, minute)
+            return {
+                "response_type": "ephemeral",
+                "text": f"✅ You'll get a digest of <#{channel_id}> every day at {subscription.schedule_label()}."
+            }
+
+        case "unsubscribe":
+            removed = digest_service.unsubscribe(team_id, channel_id, user_id)
+            return {
+                "response_type": "ephemeral",
+                "text": f"✅ Unsubscribed from <#{channel_id}> digests." if removed
+                else f"You are not subscribed to <#{channel_id}> digests."
+            }
+
+        case "list":
+            subscriptions = digest_service.list_subscriptions(team_id, user_id)
+            if not subscriptions:
+                return {"response_type": "ephemeral", "text": "You have no digest subscriptions."}
+            lines = [f"• <#{s.channel_id}> daily at {s.schedule_label()}" for s in subscriptions]
+            return {"response_type": "ephemeral", "text": "Your digests:\n" + "\n".join(lines)}
+
+        case _:
+            return {
+                "response_type": "ephemeral",
+                "text": "Usage: `/digest subscribe [HH:MM]`, `/digest unsubscribe` or `/digest list`"
+            }
@@ -6,8 +6,20 @@ from .slack_models import (
     SlackEventType,
     SlackEventWrapper
 )
+from .digest_models import (
+    DigestSubscription,
+    ChannelDigest
+)
+from .message_models import (
+    MessageRecord,
+    ChannelMessageBuffer
+)
 
 __all__ = [
     "SlackEventType",
-    "SlackEventWrapper"
+    "SlackEventWrapper",
+    "DigestSubscription",
+    "ChannelDigest",
+    "MessageRecord",
+    "ChannelMessageBuffer"
 ]
@@ -0,0 +1,31 @@
+"""
+Digest subscription models and type definitions.
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class DigestSubscription(BaseModel):
+    """Model for a user's periodic digest subscription to a channel."""
+    team_id: Optional[str] = None  # None for the single-workspace SLACK_BOT_TOKEN install
+    channel_id: str
+    user_id: str
+    hour: int = Field(9, ge=0, le=23)
+    minute: int = Field(0, ge=0, le=59)
+
+    def is_due(self, moment: datetime) -> bool:
+        """Check if the subscription is scheduled for the given minute."""
+        return moment.hour == self.hour and moment.minute == self.minute
+
+    def schedule_label(self) -> str:
+        """Return the schedule as a HH:MM string."""
+        return f"{self.hour:02d}:{self.minute:02d}"
+
+class ChannelDigest(BaseModel):
+    """Model for a precomputed channel summary."""
+    team_id: Optional[str] = None
+    channel_id: str
+    summary: str
+    latest_ts: Optional[str] = None  # ts of the newest message covered by the summary
+    generated_at: datetime
@@ -0,0 +1,153 @@
+"""
+Compact in-memory message models.
+"""
+
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+def ts_to_int(ts: str) -> int:
+    """Convert a Slack ts such as "1700000000.123456" to integer microseconds."""
+    seconds, _, fraction = ts.partition(".")
+    return int(seconds) * 1_000_000 + int(fraction.ljust(6, "0")[:6] or 0)
+
+def int_to_ts(value: int) -> str:
+    """Convert integer microseconds back to a Slack ts string."""
+    return f"{value // 1_000_000}.{value % 1_000_000:06d}"
+
+class MessageRecord:
+    """
+    A Slack message reduced to what summaries need.
+
+    Uses __slots__ instead of a per-instance dict, stores ts as an integer and
+    interns user IDs so every message from the same user shares one string.
+    """
+    __slots__ = ("user", "ts", "text")
+
+    def __init__(self, user: str, ts: int, text: str):
+        self.user = sys.intern(user)
+        self.ts = ts
+        self.text = text
+
+    @classmethod
+    def from_slack(cls, message: Dict[str, Any]) -> Optional["MessageRecord"]:
+        """Build a record from a Slack API message, or None if it has no user or text."""
+        if "user" not in message or "text" not in message or "ts" not in message:
+            return None
+        return cls(message["user"], ts_to_int(message["ts"]), message["text"])
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(user={self.user!r}, ts={int_to_ts(self.ts)!r}, text={self.text!r})"
+
+class ChannelMessageBuffer:
+    """
+    Bounded ring buffer of a channel's most recent messages, oldest first.
+
+    `coverage` counts how many of the newest messages are known to be contiguous,
+    i.e. no message in that range is missing from the buffer. Messages received
+    from events since startup are contiguous by construction; seeding from the
+    history API resets coverage to the seeded window.
+
+    `seeded_at` is the monotonic time of the last seed, or None if the buffer was
+    only ever filled from events.
+    """
+
+    def __init__(self, capacity: int):
+        self._records: Deque[MessageRecord] = deque(maxlen=capacity)
+        self.coverage = 0
+        # True when the buffer holds the channel's entire history
+        self.exhausted = False
+        self.seeded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: MessageRecord) -> None:
+        """Insert a record, keeping ts order and ignoring duplicates."""
+        records = self._records
+        if len(records) == records.maxlen:
+            self.exhausted = False
+
+        if not records or record.ts > records[-1].ts:
+            records.append(record)
+            # Appending to a full buffer drops the oldest record, so coverage cannot exceed its length
+            self.coverage = min(self.coverage + 1, len(records))
+            return
+
+        # Out of order delivery: find the position counting from the newest end
+        for position, existing in enumerate(reversed(records)):
+            if existing.ts == record.ts:
+                return
+            if existing.ts < record.ts:
+                break
+        else:
+            position = len(records)
+        if position >= len(records) and len(records) == records.maxlen:
+            return  # Older than everything in a full buffer
+        if len(records) == records.maxlen:
+            records.popleft()
+            position = min(position, len(records))
+        records.insert(len(records) - position, record)
+        if position < self.coverage:
+            self.coverage = min(self.coverage + 1, len(records))
+
+    def update(self, ts: int, text: str) -> None:
+        for record in reversed(self._records):
+            if record.ts == ts:
+                record.text = text
+                return
+
+    def remove(self, ts: int) -> None:
+        for position, record in enumerate(reversed(self._records)):
+            if record.ts == ts:
+                del self._records[len(self._records) - 1 - position]
+                if position < self.coverage:
+                    self.coverage -= 1
+                return
+
+    def seed(self, records: List[MessageRecord], exhausted: bool) -> None:
+        """
+        Replace the buffer with messages fetched from the history API.
+
+        Args:
+            records: The newest messages of the channel, newest first
+            exhausted: Whether the records are the channel's entire history
+        """
+        oldest = records[-1].ts if records else None
+        # Keep event records newer than the fetched window (e.g. received during the fetch)
+        newer = [r for r in self._records if oldest is not None and r.ts > oldest]
+        known = {r.ts for r in records}
+        merged = sorted(
+            list(reversed(records)) + [r for r in newer if r.ts not in known],
+            key=lambda r: r.ts
+        )
+        self._records = deque(merged, maxlen=self._records.maxlen)
+        self.coverage = len(self._records)
+        self.exhausted = exhausted and len(merged) <= self._records.maxlen
+        self.seeded_at = time.monotonic()
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Whether the buffer was seeded from the history API within the last `max_age` seconds."""
+        return self.seeded_at is not None and time.monotonic() - self.seeded_at <= max_age
+
+    def latest(self, limit: int, oldest: Optional[int] = None) -> Optional[List[MessageRecord]]:
+        """
+        Return up to `limit` newest messages (newest first) posted after `oldest`.
+
+        Returns None if the buffer cannot answer without possibly missing messages,
+        in which case the caller should fetch from the history API instead.
+        """
+        records: List[MessageRecord] = []
+        for index, record in enumerate(islice(reversed(self._records), self.coverage + 1)):
+            if len(records) == limit:
+                return records
+            if index >= self.coverage:
+                return None
+            if oldest is not None and record.ts <= oldest:
+                return records
+            records.append(record)
+        if len(records) == limit or self.exhausted:
+            return records
+        return None
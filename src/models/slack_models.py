@@ -15,17 +15,21 @@ class SlackEventType(BaseModel):
     event_ts: Optional[str] = None
     channel_type: Optional[str] = None  # Added for message.im events
     subtype: Optional[str] = None  # Added to handle message subtypes
+    thread_ts: Optional[str] = None
+    deleted_ts: Optional[str] = None  # Set on message_deleted events
+    message: Optional[Dict[str, Any]] = None  # Edited message on message_changed events
 
 class SlackEventWrapper(BaseModel):
     """Wrapper model for Slack events."""
     token: str
     team_id: str
+    enterprise_id: Optional[str] = None
     api_app_id: str
     event: SlackEventType
     type: str
     event_id: str
     event_time: int
-    authorizations: List[Dict[str, Any]]
+    authorizations: Optional[List[Dict[str, Any]]] = None
     is_ext_shared_channel: Optional[bool] = None
     event_context: Optional[str] = None
 
@@ -0,0 +1,37 @@
+"""
+Repository layer for named channel groups.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from src.utilities.storage_utilities import load_json_file, save_json_file
+
+class ChannelGroupRepository:
+    """Stores named groups of channels per team in a local JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Groups keyed by team ID ("" for the single-workspace install), then by name
+        self._groups: Dict[str, Dict[str, List[str]]] = load_json_file(path, {})
+
+    def list_groups(self, team_id: Optional[str]) -> Dict[str, List[str]]:
+        with self._lock:
+            return dict(self._groups.get(team_id or "", {}))
+
+    def get_group(self, team_id: Optional[str], name: str) -> Optional[List[str]]:
+        with self._lock:
+            return self._groups.get(team_id or "", {}).get(name.lower())
+
+    def save_group(self, team_id: Optional[str], name: str, channel_ids: List[str]) -> None:
+        with self._lock:
+            self._groups.setdefault(team_id or "", {})[name.lower()] = channel_ids
+            save_json_file(self.path, self._groups)
+
+    def delete_group(self, team_id: Optional[str], name: str) -> bool:
+        with self._lock:
+            if self._groups.get(team_id or "", {}).pop(name.lower(), None) is None:
+                return False
+            save_json_file(self.path, self._groups)
+            return True
@@ -0,0 +1,97 @@
+"""
+Repository layer for digest subscriptions and precomputed digests.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from src.models.digest_models import DigestSubscription, ChannelDigest
+from src.utilities.storage_utilities import load_json_file, save_json_file
+
+def _digest_key(team_id: Optional[str], channel_id: str) -> str:
+    return f"{team_id or ''}:{channel_id}"
+
+class DigestRepository:
+    """Stores digest subscriptions and precomputed digests in a local JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Guards the in-memory state; never held while writing to disk
+        self._lock = threading.Lock()
+        # Serializes writes, so a later snapshot is never overwritten by an earlier one
+        self._write_lock = threading.Lock()
+        data = load_json_file(path, {})
+        self._subscriptions: List[DigestSubscription] = [
+            DigestSubscription(**item) for item in data.get("subscriptions", [])
+        ]
+        digests = [ChannelDigest(**item) for item in data.get("digests", {}).values()]
+        self._digests: Dict[str, ChannelDigest] = {
+            _digest_key(d.team_id, d.channel_id): d for d in digests
+        }
+
+    def _save(self) -> None:
+        """Write a snapshot of the store to disk. Must be called without `_lock` held."""
+        with self._write_lock:
+            with self._lock:
+                data = {
+                    "subscriptions": [s.model_dump(mode="json") for s in self._subscriptions],
+                    "digests": {
+                        key: d.model_dump(mode="json")
+                        for key, d in self._digests.items()
+                    },
+                }
+            save_json_file(self.path, data)
+
+    def list_subscriptions(
+        self,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[DigestSubscription]:
+        """List all subscriptions, or only a user's subscriptions within a team."""
+        with self._lock:
+            if user_id is None:
+                return list(self._subscriptions)
+            return [s for s in self._subscriptions if s.team_id == team_id and s.user_id == user_id]
+
+    def add_subscription(self, subscription: DigestSubscription) -> None:
+        """Add a subscription, replacing any existing one for the same user and channel."""
+        with self._lock:
+            self._subscriptions = [
+                s for s in self._subscriptions
+                if not (
+                    s.team_id == subscription.team_id
+                    and s.user_id == subscription.user_id
+                    and s.channel_id == subscription.channel_id
+                )
+            ]
+            self._subscriptions.append(subscription)
+        self._save()
+
+    def remove_subscription(self, team_id: Optional[str], channel_id: str, user_id: str) -> bool:
+        with self._lock:
+            remaining = [
+                s for s in self._subscriptions
+                if not (s.team_id == team_id and s.user_id == user_id and s.channel_id == channel_id)
+            ]
+            removed = len(remaining) != len(self._subscriptions)
+            self._subscriptions = remaining
+            # Drop the stored digest once nobody is subscribed to the channel anymore
+            if not any(s.team_id == team_id and s.channel_id == channel_id for s in remaining):
+                self._digests.pop(_digest_key(team_id, channel_id), None)
+        if removed:
+            self._save()
+        return removed
+
+    def is_subscribed_channel(self, team_id: Optional[str], channel_id: str) -> bool:
+        with self._lock:
+            return any(s.team_id == team_id and s.channel_id == channel_id for s in self._subscriptions)
+
+    def get_digest(self, team_id: Optional[str], channel_id: str) -> Optional[ChannelDigest]:
+        with self._lock:
+            return self._digests.get(_digest_key(team_id, channel_id))
+
+    def save_digest(self, digest: ChannelDigest) -> None:
+        """Store a digest and rewrite the file. Blocks on disk I/O, so async callers should run it in a thread."""
+        with self._lock:
+            self._digests[_digest_key(digest.team_id, digest.channel_id)] = digest
+        self._save()
@@ -0,0 +1,87 @@
+"""
+Repository layer for per-channel buffers of recent messages.
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.models.message_models import ChannelMessageBuffer, MessageRecord, ts_to_int
+from src.models.slack_models import SlackEventType
+
+class MessageBufferRepository:
+    """Keeps a bounded ring buffer of recent messages for the most recently active channels, keyed per team."""
+
+    def __init__(self, capacity: int = 500, max_channels: int = 1000, ttl: float = 900):
+        """
+        Initialize the buffer repository.
+
+        Args:
+            capacity: Maximum number of messages kept per channel
+            max_channels: Maximum number of channels buffered at once
+            ttl: Seconds a buffer is trusted after being seeded from the history API.
+                Events can be dropped while the app is down or unreachable, so older
+                buffers are refreshed from the API instead of served.
+        """
+        self.capacity = capacity
+        self.max_channels = max_channels
+        self.ttl = ttl
+        self._buffers: "OrderedDict[Tuple[str, str], ChannelMessageBuffer]" = OrderedDict()
+
+    def get(self, team_id: Optional[str], channel_id: str) -> Optional[ChannelMessageBuffer]:
+        key = (team_id or "", channel_id)
+        buffer = self._buffers.get(key)
+        if buffer is not None:
+            self._buffers.move_to_end(key)
+        return buffer
+
+    def _get_or_create(self, team_id: Optional[str], channel_id: str) -> ChannelMessageBuffer:
+        buffer = self.get(team_id, channel_id)
+        if buffer is None:
+            buffer = ChannelMessageBuffer(self.capacity)
+            self._buffers[(team_id or "", channel_id)] = buffer
+            # Evict the least recently used channel
+            if len(self._buffers) > self.max_channels:
+                self._buffers.popitem(last=False)
+        return buffer
+
+    def add_event(self, team_id: Optional[str], event: SlackEventType) -> None:
+        """Apply a `message` event to its channel's buffer."""
+        if event.type != "message" or not event.channel:
+            return
+
+        match event.subtype:
+            case "message_changed":
+                buffer = self.get(team_id, event.channel)
+                message = event.message or {}
+                if buffer and "ts" in message and "text" in message:
+                    buffer.update(ts_to_int(message["ts"]), message["text"])
+            case "message_deleted":
+                buffer = self.get(team_id, event.channel)
+                if buffer and event.deleted_ts:
+                    buffer.remove(ts_to_int(event.deleted_ts))
+            case _:
+                # Thread replies are not part of the channel history
+                if event.thread_ts and event.thread_ts != event.ts and event.subtype != "thread_broadcast":
+                    return
+                if not event.user or event.text is None or not event.ts:
+                    return
+                self._get_or_create(team_id, event.channel).add(
+                    MessageRecord(event.user, ts_to_int(event.ts), event.text)
+                )
+
+    def latest(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        limit: int,
+        oldest: Optional[str] = None
+    ) -> Optional[List[MessageRecord]]:
+        """Serve the newest messages from the buffer, or None if it cannot answer completely."""
+        buffer = self.get(team_id, channel_id)
+        if buffer is None or not buffer.is_fresh(self.ttl):
+            return None
+        return buffer.latest(limit, ts_to_int(oldest) if oldest else None)
+
+    def seed(self, team_id: Optional[str], channel_id: str, records: List[MessageRecord], exhausted: bool) -> None:
+        """Fill a channel's buffer with messages fetched from the history API (newest first)."""
+        self._get_or_create(team_id, channel_id).seed(records[:self.capacity], exhausted and len(records) <= self.capacity)
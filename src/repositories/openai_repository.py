@@ -3,6 +3,7 @@ Repository layer for OpenAI operations.
 """
 
 import os
+import asyncio
 from typing import List
 from fastapi import HTTPException
 from openai import AzureOpenAI, APIError, RateLimitError, APIConnectionError
@@ -40,7 +41,9 @@ class OpenAIRepository:
         stream: bool = False
     ) -> Union[ChatCompletion, Stream[ChatCompletionChunk]]:
         try:
-            response = self.client.chat.completions.create(
+            # The OpenAI client is blocking, so run it off the event loop
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -0,0 +1,237 @@
+"""
+Registry of pooled async Slack clients, one per workspace.
+"""
+
+import ssl
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+import certifi
+from fastapi import HTTPException
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
+from slack_sdk.oauth.installation_store.async_installation_store import AsyncInstallationStore
+
+from src.utilities.storage_utilities import load_json_file, save_json_file
+
+class _TeamClient:
+    """A team's client together with its connection pool and usage bookkeeping."""
+
+    def __init__(self, client: AsyncWebClient, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore):
+        self.client = client
+        self.session = session
+        self.semaphore = semaphore
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+class SlackClientRegistry:
+    """
+    Lazily creates an AsyncWebClient with its own connection pool per team_id.
+
+    Each team's client limits how many API calls run at once and retries
+    rate-limited calls after Slack's Retry-After delay, so one busy workspace
+    cannot exhaust another's rate limits. Clients idle for longer than
+    `idle_timeout` seconds are closed, so idle workspaces hold no connections.
+    """
+
+    def __init__(
+        self,
+        installation_store: Optional[AsyncInstallationStore] = None,
+        default_token: Optional[str] = None,
+        idle_timeout: float = 300,
+        max_connections: int = 10,
+        max_concurrent_calls: int = 4,
+        team_store_path: Optional[str] = None
+    ):
+        """
+        Initialize the client registry.
+
+        Args:
+            installation_store: Store holding bot tokens of OAuth installs
+            default_token: Bot token used without OAuth installs, or for its own team when
+                that team has no installation
+            idle_timeout: Seconds after which an unused client and its connections are closed
+            max_connections: Connection pool size of each team's client
+            max_concurrent_calls: Maximum number of concurrent API calls per team
+            team_store_path: JSON file remembering each team's enterprise, so org-wide
+                installs can still be found for scheduled work after a restart
+        """
+        self.installation_store = installation_store
+        self.default_token = default_token
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.max_concurrent_calls = max_concurrent_calls
+        self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self._clients: Dict[str, _TeamClient] = {}
+        # Held only while a team's client is being created, so a slow token lookup
+        # never blocks API calls of other workspaces
+        self._creation_locks: Dict[str, asyncio.Lock] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.team_store_path = team_store_path
+        # Enterprise context of each team, as reported by Slack requests
+        self._teams: Dict[str, Dict[str, Any]] = load_json_file(team_store_path, {}) if team_store_path else {}
+        self._default_team_id: Optional[str] = None
+        self._default_team_lock = asyncio.Lock()
+        self._default_team_checked = False
+
+    async def register_team(
+        self,
+        team_id: Optional[str],
+        enterprise_id: Optional[str],
+        is_enterprise_install: bool
+    ) -> None:
+        """Remember which enterprise a team belongs to and whether it is covered by an org-wide install."""
+        if not team_id:
+            return
+        context = {"enterprise_id": enterprise_id, "is_enterprise_install": bool(is_enterprise_install)}
+        if self._teams.get(team_id) == context:
+            return
+        self._teams[team_id] = context
+        if self.team_store_path:
+            save_json_file(self.team_store_path, self._teams)
+        # The team's token may now come from a different installation
+        await self.invalidate(team_id)
+
+    async def _get_default_team_id(self) -> Optional[str]:
+        # Look the team up once; a failed lookup is remembered rather than retried on every client creation
+        async with self._default_team_lock:
+            if not self._default_team_checked and self.default_token:
+                try:
+                    response = await AsyncWebClient(token=self.default_token, ssl=self._ssl_context).auth_test()
+                    self._default_team_id = response["team_id"]
+                except SlackApiError as e:
+                    print(f"Error looking up the default token's team: {e.response['error']}")
+                except Exception as e:
+                    print(f"Unexpected error looking up the default token's team: {str(e)}")
+                self._default_team_checked = True
+        return self._default_team_id
+
+    async def _find_token(self, team_id: Optional[str]) -> Optional[str]:
+        if not self.installation_store:
+            return self.default_token
+        if team_id:
+            context = self._teams.get(team_id, {})
+            bot = await self.installation_store.async_find_bot(
+                enterprise_id=context.get("enterprise_id"),
+                team_id=team_id,
+                is_enterprise_install=context.get("is_enterprise_install", False)
+            )
+            if bot:
+                return bot.bot_token
+        # Never hand one workspace's token to another workspace
+        if self.default_token and (not team_id or team_id == await self._get_default_team_id()):
+            return self.default_token
+        return None
+
+    async def _get_or_create(self, team_id: Optional[str]) -> _TeamClient:
+        key = team_id or ""
+        entry = self._clients.get(key)
+        if entry is None:
+            async with self._creation_locks.setdefault(key, asyncio.Lock()):
+                # Another call may have created the client while this one waited
+                entry = self._clients.get(key)
+                if entry is None:
+                    entry = await self._create(team_id)
+                    self._clients[key] = entry
+        # No await between the lookup and this point, so eviction cannot close the entry in between
+        entry.in_use += 1
+        entry.last_used = time.monotonic()
+        return entry
+
+    async def _create(self, team_id: Optional[str]) -> _TeamClient:
+        token = await self._find_token(team_id)
+        if not token:
+            raise HTTPException(
+                status_code=401,
+                detail=f"No Slack installation found for team {team_id}."
+            )
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, ssl=self._ssl_context)
+        )
+        return _TeamClient(
+            client=AsyncWebClient(
+                token=token,
+                session=session,
+                retry_handlers=[AsyncRateLimitErrorRetryHandler(max_retry_count=2)]
+            ),
+            session=session,
+            semaphore=asyncio.Semaphore(self.max_concurrent_calls)
+        )
+
+    @asynccontextmanager
+    async def client(self, team_id: Optional[str]) -> AsyncIterator[AsyncWebClient]:
+        """Borrow a team's client, waiting for a free slot in its concurrency limit."""
+        entry = await self._get_or_create(team_id)
+        try:
+            async with entry.semaphore:
+                yield entry.client
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            # Close clients that were invalidated while this call was using them
+            if entry.in_use == 0 and self._clients.get(team_id or "") is not entry:
+                await entry.session.close()
+
+    def start(self) -> None:
+        """Start closing idle clients in the background."""
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.create_task(self._sweep())
+
+    async def stop(self) -> None:
+        """Stop the idle client sweep."""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+    async def _sweep(self) -> None:
+        # Runs on a timer so clients are closed even when no workspace is active
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                print(f"Error closing idle Slack clients: {str(e)}")
+
+    async def evict_idle(self) -> None:
+        """Close clients that have not been used within the idle timeout."""
+        now = time.monotonic()
+        idle = [
+            key for key, entry in self._clients.items()
+            if entry.in_use == 0 and now - entry.last_used >= self.idle_timeout
+        ]
+        entries = [self._clients.pop(key) for key in idle]
+        # Forget creation locks of teams without a client that nobody is waiting on
+        for key in [k for k, lock in self._creation_locks.items() if k not in self._clients and not lock.locked()]:
+            del self._creation_locks[key]
+        for entry in entries:
+            await entry.session.close()
+
+    async def invalidate(self, team_id: Optional[str]) -> None:
+        """Drop a team's client, e.g. after a reinstall changed its token."""
+        entry = self._clients.pop(team_id or "", None)
+        if entry and entry.in_use == 0:
+            await entry.session.close()
+
+    async def invalidate_enterprise(self, enterprise_id: str) -> None:
+        """Drop the clients of every team covered by an enterprise's org-wide install."""
+        team_ids = [
+            team_id for team_id, context in self._teams.items()
+            if context["enterprise_id"] == enterprise_id and context["is_enterprise_install"]
+        ]
+        for team_id in team_ids:
+            await self.invalidate(team_id)
+
+    async def close(self) -> None:
+        """Close every client's connection pool."""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        for entry in entries:
+            await entry.session.close()
@@ -2,61 +2,59 @@
 Repository layer for Slack operations.
 """
 
-import os
-import ssl
-import json
-import re
-from typing import List, Dict, Set, Optional, Any
+import time
+import asyncio
+from collections import OrderedDict
+from typing import List, Dict, Set, Optional, Any, Tuple
 from fastapi import HTTPException
 
-import certifi
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from src.models.message_models import MessageRecord
+from src.repositories.message_buffer_repository import MessageBufferRepository
+from src.repositories.slack_client_registry import SlackClientRegistry
+
 class SlackRepository:
-    def __init__(self):
-        try:
-            token = os.getenv("SLACK_BOT_TOKEN")
-            if not token:
-                raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
-                
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            self.client = WebClient(token=token, ssl=ssl_context)
-        except Exception as e:
-            print(f"Error initializing Slack client: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to initialize Slack client. Please check your configuration."
-            )
+    def __init__(
+        self,
+        clients: SlackClientRegistry,
+        message_buffers: Optional[MessageBufferRepository] = None,
+        user_cache_ttl: float = 3600,
+        user_cache_size: int = 10000
+    ):
+        self.clients = clients
+        self.message_buffers = message_buffers
+        self.user_cache_ttl = user_cache_ttl
+        self.user_cache_size = user_cache_size
+        # User info keyed by (team_id, user_id) with its expiry time, least recently used first
+        self._user_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+
+    async def fetch_history(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        limit: int = 20,
+        oldest: Optional[str] = None
+    ) -> List[MessageRecord]:
+        """Fetch channel messages, newest first, optionally only those after `oldest`."""
+        if self.message_buffers:
+            buffered = self.message_buffers.latest(team_id, channel_id, limit, oldest)
+            if buffered is not None:
+                return buffered
 
-    async def fetch_messages(self, channel_id: str, limit: int = 20) -> str:
         try:
-            # Get messages from the channel
-            response = self.client.conversations_history(channel=channel_id, limit=limit)
-            messages = response["messages"]
-            
-            # Extract all unique user IDs from messages
-            user_ids: Set[str] = set()
-            for msg in messages:
-                if "user" in msg:
-                    user_ids.add(msg["user"])
-            
-            # Get user info for all users
-            users_map = {}
-            for user_id in user_ids:
-                user_data = await self.get_user_info(user_id)
-                users_map[user_id] = user_data["display_name"]
-            
-            # Format messages as a conversation string
-            conversation = []
-            # Reverse messages to show oldest first
-            for msg in reversed(messages):
-                if "text" in msg and "user" in msg:
-                    user_name = users_map.get(msg["user"], "Unknown")
-                    conversation.append(f"{user_name}: {msg['text']}")
-            
-            # Join messages with newlines
-            return "\n".join(conversation)
+            kwargs: Dict[str, Any] = {"channel": channel_id, "limit": limit}
+            if oldest:
+                kwargs["oldest"] = oldest
+            async with self.clients.client(team_id) as client:
+                response = await client.conversations_history(**kwargs)
+            records = [
+                record for record in map(MessageRecord.from_slack, response["messages"])
+                if record is not None
+            ]
+            if self.message_buffers and not oldest:
+                self.message_buffers.seed(team_id, channel_id, records, exhausted=not response.get("has_more", False))
+            return records
 
         except SlackApiError as e:
             print(f"Error fetching messages: {e.response['error']}")
@@ -70,18 +68,109 @@ class SlackRepository:
                 status_code=500,
                 detail="An unexpected error occurred while fetching messages."
             )
+
+    async def format_messages(
+        self,
+        team_id: Optional[str],
+        messages: List[MessageRecord],
+        users_map: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Format messages (newest first) as a conversation string, oldest first."""
+        if users_map is None:
+            users_map = await self.get_user_names(team_id, self.collect_user_ids(messages))
+
+        # Join references to the existing name prefixes and texts in one pass instead of
+        # allocating a separate "name: text" string per message
+        prefixes = {user_id: f"{name}: " for user_id, name in users_map.items()}
+        parts: List[str] = []
+        append = parts.append
+        # Reverse messages to show oldest first
+        for msg in reversed(messages):
+            append(prefixes.get(msg.user, "Unknown: "))
+            append(msg.text)
+            append("\n")
+        if parts:
+            parts.pop()
+        return "".join(parts)
+
+    async def fetch_messages(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        limit: int = 20,
+        oldest: Optional[str] = None
+    ) -> str:
+        messages = await self.fetch_history(team_id, channel_id, limit=limit, oldest=oldest)
+        return await self.format_messages(team_id, messages)
+
+    @staticmethod
+    def collect_user_ids(messages: List[MessageRecord]) -> Set[str]:
+        """Extract all unique user IDs from messages."""
+        return {msg.user for msg in messages}
+
+    async def get_user_names(self, team_id: Optional[str], user_ids: Set[str]) -> Dict[str, str]:
+        """Look up display names for a set of users concurrently, one request per user."""
+        users = await asyncio.gather(*(self.get_user_info(team_id, user_id) for user_id in user_ids))
+        return {user["id"]: user["display_name"] for user in users}
+
+    async def get_channel_name(self, team_id: Optional[str], channel_id: str) -> str:
+        try:
+            async with self.clients.client(team_id) as client:
+                response = await client.conversations_info(channel=channel_id)
+            return response["channel"].get("name") or channel_id
+        except SlackApiError as e:
+            print(f"Error fetching channel info for {channel_id}: {e.response['error']}")
+            return channel_id
+
+    async def resolve_channel_names(self, team_id: Optional[str], names: List[str]) -> Dict[str, str]:
+        """Resolve channel names (without #) to channel IDs, stopping once all are found."""
+        remaining = set(names)
+        resolved: Dict[str, str] = {}
+        cursor = None
+        try:
+            while remaining:
+                async with self.clients.client(team_id) as client:
+                    response = await client.conversations_list(
+                        types="public_channel,private_channel",
+                        exclude_archived=True,
+                        limit=1000,
+                        cursor=cursor
+                    )
+                for channel in response["channels"]:
+                    if channel["name"] in remaining:
+                        resolved[channel["name"]] = channel["id"]
+                        remaining.discard(channel["name"])
+                cursor = response.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+        except SlackApiError as e:
+            print(f"Error listing channels: {e.response['error']}")
+        return resolved
         
-    async def get_user_info(self, user_id: str) -> Dict:
+    async def get_user_info(self, team_id: Optional[str], user_id: str) -> Dict:
+        cache_key = (team_id or "", user_id)
+        cached = self._user_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._user_cache.move_to_end(cache_key)
+            return cached[1]
+
         try:
-            response = self.client.users_info(user=user_id)
+            async with self.clients.client(team_id) as client:
+                response = await client.users_info(user=user_id)
             user = response["user"]
-            return {
+            user_info = {
                 "id": user_id,
                 "display_name": user["profile"].get("display_name") or user["real_name"],
                 "real_name": user["real_name"],
                 "email": user["profile"].get("email", ""),
                 "is_bot": user.get("is_bot", False)
             }
+            self._user_cache[cache_key] = (time.monotonic() + self.user_cache_ttl, user_info)
+            self._user_cache.move_to_end(cache_key)
+            # Bound memory across workspaces by evicting the least recently used users
+            while len(self._user_cache) > self.user_cache_size:
+                self._user_cache.popitem(last=False)
+            return user_info
         except SlackApiError as e:
             print(f"Error fetching user info for {user_id}: {e.response['error']}")
             return {
@@ -90,4 +179,19 @@ class SlackRepository:
                 "real_name": "Unknown",
                 "email": "",
                 "is_bot": False
-            }
\ No newline at end of file
+            }
+
+    async def join_channel(self, team_id: Optional[str], channel_id: str) -> None:
+        async with self.clients.client(team_id) as client:
+            await client.conversations_join(channel=channel_id)
+
+    async def open_dm(self, team_id: Optional[str], user_id: str) -> str:
+        """Open a DM with the user and return its channel ID."""
+        async with self.clients.client(team_id) as client:
+            result = await client.conversations_open(users=[user_id])
+        return result["channel"]["id"]
+
+    async def post_message(self, team_id: Optional[str], channel_id: str, **kwargs: Any) -> Dict[str, Any]:
+        async with self.clients.client(team_id) as client:
+            response = await client.chat_postMessage(channel=channel_id, **kwargs)
+        return response.data
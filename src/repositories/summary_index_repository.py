@@ -0,0 +1,86 @@
+"""
+Repository layer for the similarity index of recently summarized message windows.
+"""
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from src.utilities.similarity_utilities import estimate_jaccard
+
+class SummaryIndexEntry:
+    """
+    A summarized message window: its message keys, MinHash signature and summary.
+
+    `depth` counts how many incremental merges the summary has gone through since
+    it was last generated from the full window.
+    """
+    __slots__ = ("team_id", "channel_id", "keys", "signature", "summary", "depth")
+
+    def __init__(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        keys: FrozenSet[int],
+        signature: Tuple[int, ...],
+        summary: str,
+        depth: int = 0
+    ):
+        self.team_id = team_id
+        self.channel_id = channel_id
+        self.keys = keys
+        self.signature = signature
+        self.summary = summary
+        self.depth = depth
+
+class SummaryIndexRepository:
+    """Keeps the most recently used summarized windows, bounded to `max_entries`."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, SummaryIndexEntry]" = OrderedDict()
+        # Entry IDs per (team_id, channel_id), so lookups only compare windows of the same channel
+        self._by_channel: Dict[Tuple[str, str], List[int]] = {}
+        self._next_id = 0
+
+    def find_similar(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        signature: Tuple[int, ...],
+        threshold: float
+    ) -> Optional[Tuple[SummaryIndexEntry, float]]:
+        """Return the most similar window of the channel at or above `threshold`, if any."""
+        best: Optional[Tuple[int, float]] = None
+        for entry_id in self._by_channel.get((team_id or "", channel_id), []):
+            similarity = estimate_jaccard(signature, self._entries[entry_id].signature)
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (entry_id, similarity)
+        if best is None:
+            return None
+
+        self._entries.move_to_end(best[0])
+        return self._entries[best[0]], best[1]
+
+    def replace(self, old: SummaryIndexEntry, new: SummaryIndexEntry) -> None:
+        """Swap a cached window for its updated version, or add it if the old one was evicted meanwhile."""
+        for entry_id in self._by_channel.get((old.team_id or "", old.channel_id), []):
+            if self._entries[entry_id] is old:
+                self._entries[entry_id] = new
+                self._entries.move_to_end(entry_id)
+                return
+        self.add(new)
+
+    def add(self, entry: SummaryIndexEntry) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        self._by_channel.setdefault((entry.team_id or "", entry.channel_id), []).append(entry_id)
+
+        # Evict the least recently used windows
+        while len(self._entries) > self.max_entries:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            channel_key = (evicted.team_id or "", evicted.channel_id)
+            ids = self._by_channel[channel_key]
+            ids.remove(evicted_id)
+            if not ids:
+                del self._by_channel[channel_key]
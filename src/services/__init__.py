@@ -4,8 +4,14 @@ Service layer implementations for the Slack AI Bot application.
 
 from .slack_service import SlackService
 from .openai_service import OpenAIService
+from .digest_service import DigestService
+from .scheduler_service import SchedulerService
+from .summary_cache_service import SummaryCacheService
 
 __all__ = [
     "SlackService",
     "OpenAIService",
+    "DigestService",
+    "SchedulerService",
+    "SummaryCacheService",
 ]
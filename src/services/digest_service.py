@@ -0,0 +1,132 @@
+"""
+Service layer for precomputed channel digests.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from src.models.digest_models import DigestSubscription, ChannelDigest
+from src.models.message_models import int_to_ts
+from src.repositories.digest_repository import DigestRepository
+from src.repositories.slack_repository import SlackRepository
+from src.services.openai_service import OpenAIService
+
+class DigestService:
+    def __init__(
+        self,
+        digest_repository: DigestRepository,
+        slack_repository: SlackRepository,
+        openai_service: OpenAIService,
+        message_limit: int = 200,
+        max_delta_messages: int = 30,
+        max_age: timedelta = timedelta(hours=24)
+    ):
+        """
+        Initialize the digest service.
+
+        Args:
+            digest_repository: Store for subscriptions and precomputed digests
+            slack_repository: Slack API repository used to fetch channel history
+            openai_service: Service used to generate and update summaries
+            message_limit: Maximum number of messages covered by a precomputed digest
+            max_delta_messages: Largest number of new messages merged into a stored digest
+                before falling back to a full summary
+            max_age: Age after which a stored digest is no longer served
+        """
+        self.digest_repository = digest_repository
+        self.slack_repository = slack_repository
+        self.openai_service = openai_service
+        self.message_limit = message_limit
+        self.max_delta_messages = max_delta_messages
+        self.max_age = max_age
+
+    def subscribe(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        user_id: str,
+        hour: int,
+        minute: int
+    ) -> DigestSubscription:
+        subscription = DigestSubscription(
+            team_id=team_id,
+            channel_id=channel_id,
+            user_id=user_id,
+            hour=hour,
+            minute=minute
+        )
+        self.digest_repository.add_subscription(subscription)
+        return subscription
+
+    def unsubscribe(self, team_id: Optional[str], channel_id: str, user_id: str) -> bool:
+        return self.digest_repository.remove_subscription(team_id, channel_id, user_id)
+
+    def list_subscriptions(
+        self,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[DigestSubscription]:
+        return self.digest_repository.list_subscriptions(team_id, user_id)
+
+    async def precompute(self, team_id: Optional[str], channel_id: str) -> ChannelDigest:
+        """Summarize the channel from scratch and store the result."""
+        messages = await self.slack_repository.fetch_history(team_id, channel_id, limit=self.message_limit)
+        conversation = await self.slack_repository.format_messages(team_id, messages)
+        summary = await self.openai_service.generate_summary(conversation)
+        digest = ChannelDigest(
+            team_id=team_id,
+            channel_id=channel_id,
+            summary=summary,
+            latest_ts=int_to_ts(messages[0].ts) if messages else None,
+            generated_at=datetime.now()
+        )
+        # Rewriting the store is blocking file I/O, keep it off the event loop
+        await asyncio.to_thread(self.digest_repository.save_digest, digest)
+        return digest
+
+    async def get_summary(self, team_id: Optional[str], channel_id: str) -> Optional[str]:
+        """
+        Serve a summary for a subscribed channel from its stored digest plus any new messages.
+
+        Args:
+            team_id: The workspace the channel belongs to
+            channel_id: The channel to summarize
+
+        Returns:
+            The up-to-date summary, or None if the channel has no usable digest and
+            should be summarized on demand instead
+        """
+        if not self.digest_repository.is_subscribed_channel(team_id, channel_id):
+            return None
+
+        digest = self.digest_repository.get_digest(team_id, channel_id)
+        if not digest or datetime.now() - digest.generated_at > self.max_age:
+            return None
+
+        # Fetch one extra message so an oversized delta can be detected
+        delta = await self.slack_repository.fetch_history(
+            team_id,
+            channel_id,
+            limit=self.max_delta_messages + 1,
+            oldest=digest.latest_ts
+        )
+        if not delta:
+            return digest.summary
+        if len(delta) > self.max_delta_messages:
+            return None
+
+        new_messages = await self.slack_repository.format_messages(team_id, delta)
+        if not new_messages:
+            return digest.summary
+
+        summary = await self.openai_service.update_summary(digest.summary, new_messages)
+        # Keep the original generation time so repeated small updates cannot extend its life forever
+        await asyncio.to_thread(self.digest_repository.save_digest, ChannelDigest(
+            team_id=team_id,
+            channel_id=channel_id,
+            summary=summary,
+            latest_ts=int_to_ts(delta[0].ts),
+            generated_at=digest.generated_at
+        ))
+        return summary
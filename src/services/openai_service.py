@@ -2,8 +2,19 @@
 Service layer for OpenAI operations.
 """
 
+import asyncio
+from typing import Dict, List
+from openai.types.chat import ChatCompletionMessageParam
+
 from src.repositories.openai_repository import OpenAIRepository
-from src.utilities.openai_utilities import prepare_messages, _extract_content_from_dict
+from src.utilities.openai_utilities import (
+    prepare_messages,
+    prepare_update_messages,
+    prepare_channel_notes_messages,
+    prepare_multi_channel_messages,
+    format_channel_sections,
+    _extract_content_from_dict
+)
 
 class OpenAIService:
     def __init__(self, max_tokens=1024, temperature=0.1):
@@ -30,24 +41,95 @@ class OpenAIService:
             A string containing the summary
         """
         try:
-            messages = prepare_messages(conversation_messages)
+            return await self.generate_summary(conversation_messages)
+                
+        except Exception as e:
+            error_message = f"Error generating summary: {str(e)}"
+            return error_message
+
+    async def generate_summary(self, conversation_messages: str) -> str:
+        """
+        Summarize a conversation, raising on failure instead of returning an error message.
+        
+        Args:
+            conversation_messages: String containing conversation messages
+            
+        Returns:
+            A string containing the summary
+        """
+        messages = prepare_messages(conversation_messages)
+        return await self._complete(messages)
+
+    async def update_summary(self, summary: str, new_messages: str) -> str:
+        """
+        Update an existing summary with messages posted after it was generated.
+        
+        Args:
+            summary: The previously generated summary
+            new_messages: String containing the newer conversation messages
             
-            response = await self.repository.create_chat_completion(
-                messages=messages,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
+        Returns:
+            A string containing the updated summary
+        """
+        messages = prepare_update_messages(summary, new_messages)
+        return await self._complete(messages)
+
+    async def summarize_channels(self, transcripts: Dict[str, str], char_budget: int = 24000) -> str:
+        """
+        Build one digest out of several channel conversations.
+
+        Conversations are packed into as few requests as fit within `char_budget`. If
+        they all fit in one request the digest is written directly, otherwise each pack
+        is condensed into notes concurrently and the notes are merged in a final request.
+        
+        Args:
+            transcripts: Mapping of channel name to its conversation
+            char_budget: Maximum number of conversation characters per request
             
-            # Extract the response content
-            if hasattr(response, 'choices') and len(response.choices) > 0:
-                if hasattr(response.choices[0], 'message') and hasattr(response.choices[0].message, 'content'):
-                    return response.choices[0].message.content
+        Returns:
+            A string containing the combined digest
+        """
+        try:
+            packs: List[Dict[str, str]] = []
+            pack_size = 0
+            for name, conversation in transcripts.items():
+                if not conversation:
+                    continue
+                if packs and pack_size + len(conversation) <= char_budget:
+                    packs[-1][name] = conversation
+                    pack_size += len(conversation)
                 else:
-                    return _extract_content_from_dict(response.choices[0])
-            else:
-                return "No summary could be generated."
-                
+                    packs.append({name: conversation})
+                    pack_size = len(conversation)
+
+            if not packs:
+                return "No messages found in the selected channels."
+            if len(packs) == 1:
+                return await self._complete(prepare_multi_channel_messages(format_channel_sections(packs[0])))
+
+            notes = await asyncio.gather(*(
+                self._complete(prepare_channel_notes_messages(pack)) for pack in packs
+            ))
+            return await self._complete(prepare_multi_channel_messages("\n\n".join(notes)))
+
         except Exception as e:
             error_message = f"Error generating summary: {str(e)}"
             return error_message
+
+    async def _complete(self, messages: List[ChatCompletionMessageParam]) -> str:
+        """Run a chat completion and extract the response content."""
+        response = await self.repository.create_chat_completion(
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        # Extract the response content
+        if hasattr(response, 'choices') and len(response.choices) > 0:
+            if hasattr(response.choices[0], 'message') and hasattr(response.choices[0].message, 'content'):
+                return response.choices[0].message.content
+            else:
+                return _extract_content_from_dict(response.choices[0])
+        else:
+            return "No summary could be generated."
     
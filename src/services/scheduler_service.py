@@ -0,0 +1,135 @@
+"""
+Service layer for scheduling periodic channel digests.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models.digest_models import DigestSubscription
+from src.services.digest_service import DigestService
+from src.services.slack_service import SlackService
+
+class SchedulerService:
+    def __init__(
+        self,
+        digest_service: DigestService,
+        slack_service: SlackService,
+        concurrency: int = 3,
+        precompute_lead: timedelta = timedelta(minutes=30)
+    ):
+        """
+        Initialize the digest scheduler.
+
+        Args:
+            digest_service: Service that precomputes and serves channel digests
+            slack_service: Service used to deliver digests to subscribers
+            concurrency: Maximum number of channels summarized at the same time
+            precompute_lead: How long before delivery a channel's digest is precomputed
+        """
+        self.digest_service = digest_service
+        self.slack_service = slack_service
+        self.precompute_lead = precompute_lead
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._task: Optional[asyncio.Task] = None
+        self._last_run: Optional[datetime] = None
+
+    def start(self) -> None:
+        """Start the scheduler loop in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_due(datetime.now())
+            except Exception as e:
+                print(f"Error in digest scheduler: {str(e)}")
+            # Wake up at the start of the next minute
+            await asyncio.sleep(60 - datetime.now().second)
+
+    async def run_due(self, now: datetime) -> None:
+        """
+        Precompute and deliver every digest scheduled since the last run.
+
+        A slow run can make the loop wake up minutes late, so every minute in
+        (last run, now] is handled rather than only the current one.
+
+        Args:
+            now: The current time
+        """
+        now = now.replace(second=0, microsecond=0)
+        minute = now if self._last_run is None else self._last_run + timedelta(minutes=1)
+        if minute > now:
+            return
+        self._last_run = now
+
+        while minute <= now:
+            await self._run_minute(minute)
+            minute += timedelta(minutes=1)
+
+    async def _run_minute(self, now: datetime) -> None:
+        subscriptions = self.digest_service.list_subscriptions()
+        precompute_at = now + self.precompute_lead
+        to_precompute = {(s.team_id, s.channel_id) for s in subscriptions if s.is_due(precompute_at)}
+        to_deliver = [s for s in subscriptions if s.is_due(now)]
+
+        if to_precompute:
+            print(f"Precomputing digests for {len(to_precompute)} channel(s)")
+            await self.precompute_digests(to_precompute)
+        if to_deliver:
+            print(f"Delivering {len(to_deliver)} digest(s)")
+            await self.deliver_digests(to_deliver)
+
+    async def precompute_digests(self, channels: Iterable[Tuple[Optional[str], str]]) -> None:
+        """Precompute digests for a batch of (team_id, channel_id) pairs with bounded concurrency."""
+        await asyncio.gather(*(self._precompute(team_id, channel_id) for team_id, channel_id in channels))
+
+    async def _precompute(self, team_id: Optional[str], channel_id: str) -> None:
+        async with self._semaphore:
+            try:
+                await self.digest_service.precompute(team_id, channel_id)
+            except Exception as e:
+                print(f"Error precomputing digest for {channel_id}: {str(e)}")
+
+    async def deliver_digests(self, subscriptions: List[DigestSubscription]) -> None:
+        """Deliver digests, summarizing each channel once for all of its subscribers."""
+        by_channel: Dict[Tuple[Optional[str], str], List[DigestSubscription]] = {}
+        for subscription in subscriptions:
+            by_channel.setdefault((subscription.team_id, subscription.channel_id), []).append(subscription)
+
+        await asyncio.gather(*(
+            self._deliver(team_id, channel_id, channel_subscriptions)
+            for (team_id, channel_id), channel_subscriptions in by_channel.items()
+        ))
+
+    async def _deliver(
+        self,
+        team_id: Optional[str],
+        channel_id: str,
+        subscriptions: List[DigestSubscription]
+    ) -> None:
+        async with self._semaphore:
+            try:
+                summary = await self.digest_service.get_summary(team_id, channel_id)
+                if summary is None:
+                    summary = (await self.digest_service.precompute(team_id, channel_id)).summary
+            except Exception as e:
+                print(f"Error building digest for {channel_id}: {str(e)}")
+                return
+
+        for subscription in subscriptions:
+            try:
+                await self.slack_service.send_summary(team_id, subscription.user_id, summary)
+            except Exception as e:
+                print(f"Error delivering digest to {subscription.user_id}: {str(e)}")
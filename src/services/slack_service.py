@@ -1,27 +1,42 @@
-import ssl
-import certifi
-import os
-from slack_sdk import WebClient
+import asyncio
 from slack_sdk.errors import SlackApiError
-import json
+from typing import List, Dict, Any, Optional, Set
+from src.models.message_models import MessageRecord
 from src.repositories.slack_repository import SlackRepository
 from src.services.openai_service import OpenAIService
+from src.services.digest_service import DigestService
+from src.services.summary_cache_service import SummaryCacheService
+
+# Slack Block Kit limits
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_HEADER_TEXT_LENGTH = 150
+MAX_SECTION_TEXT_LENGTH = 3000
+
+# conversations.join errors that do not stop the bot from reading the channel:
+# private channels and DMs cannot be joined, the app has to be invited instead
+IGNORED_JOIN_ERRORS = {"method_not_supported_for_channel_type", "already_in_channel"}
 
 class SlackService:
-    def __init__(self, slack_repository: SlackRepository, openai_service: OpenAIService):
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        self.client = WebClient(
-            token=os.getenv("SLACK_BOT_TOKEN"),
-            ssl=ssl_context
-        )
+    def __init__(
+        self,
+        slack_repository: SlackRepository,
+        openai_service: OpenAIService,
+        digest_service: Optional[DigestService] = None,
+        max_batch_channels: int = 10,
+        batch_char_budget: int = 24000,
+        summary_cache_service: Optional[SummaryCacheService] = None
+    ):
         self.slack_repository = slack_repository
         self.openai_service = openai_service
+        self.digest_service = digest_service
+        self.max_batch_channels = max_batch_channels
+        self.batch_char_budget = batch_char_budget
+        self.summary_cache_service = summary_cache_service
         
-    async def get_bot_user_channel_id(self, user_id: str) -> str:
+    async def get_bot_user_channel_id(self, team_id: Optional[str], user_id: str) -> str:
         """Create a group DM with the user and the bot."""
         try:
-            result = self.client.conversations_open(users=[user_id])
-            return result["channel"]["id"]
+            return await self.slack_repository.open_dm(team_id, user_id)
         except Exception as e:
             print(f"Error creating group DM: {str(e)}")
             raise e
@@ -56,68 +71,210 @@ class SlackService:
         text = text.replace("### ", "*")
         return text
 
-    async def handle_summary(self, channel_id: str, user_id: str) -> None:
-        """Handle the summary command."""
+    async def join_channel(self, team_id: Optional[str], channel_id: str) -> None:
+        """Join a channel so its history can be read."""
         try:
-            try:
-                joinResponse = self.client.conversations_join(channel=channel_id)
-                print(joinResponse)
-            except SlackApiError as e:
-                print(e.response)
-                raise e
-            
-            # Get messages from the channel
-            messages = await self.slack_repository.fetch_messages(channel_id)
-                    
-            # Generate summary using OpenAI
-            summary = await self.openai_service.analyze_conversation(
-                conversation_messages=messages
-            )
+            await self.slack_repository.join_channel(team_id, channel_id)
+        except SlackApiError as e:
+            print(e.response)
+            raise e
 
-            channel_id = await self.get_bot_user_channel_id(user_id)
-            # Format the summary using markdown conversion
-            formatted_summary = self._convert_markdown_to_mrkdwn(summary)
-            
-            # Convert ** text to header block
-            blocks = []
-            parts = summary.split("**")
-            for i, part in enumerate(parts):
-                if i % 2 == 1:  # Odd indices are the bold text
-                    blocks.append({
-                        "type": "header",
-                        "text": {
-                            "type": "plain_text",
-                            "text": part
-                        }
-                    })
-                elif part.strip():  # Only add non-empty content
+    def _split_section_text(self, text: str) -> List[str]:
+        """Split text into chunks that fit in a section block, preferring line breaks."""
+        chunks = []
+        while len(text) > MAX_SECTION_TEXT_LENGTH:
+            cut = text.rfind("\n", 0, MAX_SECTION_TEXT_LENGTH)
+            if cut <= 0:
+                cut = MAX_SECTION_TEXT_LENGTH
+            chunks.append(text[:cut])
+            text = text[cut:].lstrip("\n")
+        if text.strip():
+            chunks.append(text)
+        return chunks
+
+    def _build_summary_blocks(self, summary: str) -> List[Dict[str, Any]]:
+        """Convert ** text to header blocks and the rest to mrkdwn sections."""
+        blocks = []
+        parts = summary.split("**")
+        for i, part in enumerate(parts):
+            if i % 2 == 1:  # Odd indices are the bold text
+                blocks.append({
+                    "type": "header",
+                    "text": {
+                        "type": "plain_text",
+                        "text": part[:MAX_HEADER_TEXT_LENGTH]
+                    }
+                })
+            elif part.strip():  # Only add non-empty content
+                for chunk in self._split_section_text(self._convert_markdown_to_mrkdwn(part)):
                     blocks.append({
                         "type": "section",
                         "text": {
                             "type": "mrkdwn",
-                            "text": self._convert_markdown_to_mrkdwn(part)
+                            "text": chunk
                         }
                     })
-            
-            self.client.chat_postMessage(
-                channel=channel_id,
-                text=formatted_summary,
-                blocks=blocks,
+        return blocks
+
+    def _paginate_blocks(self, blocks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split blocks into message-sized pages, each ending with a page indicator."""
+        # Leave room for the page indicator on every page
+        page_size = MAX_BLOCKS_PER_MESSAGE - 1
+        pages = [blocks[i:i + page_size] for i in range(0, len(blocks), page_size)] or [[]]
+        if len(pages) > 1:
+            for number, page in enumerate(pages, start=1):
+                page.append({
+                    "type": "context",
+                    "elements": [{"type": "mrkdwn", "text": f"Page {number} of {len(pages)}"}]
+                })
+        return pages
+
+    async def send_summary(self, team_id: Optional[str], user_id: str, summary: str) -> None:
+        """Send a summary to the user in a DM, continuing long summaries in a thread."""
+        channel_id = await self.get_bot_user_channel_id(team_id, user_id)
+        # Format the summary using markdown conversion
+        formatted_summary = self._convert_markdown_to_mrkdwn(summary)
+        pages = self._paginate_blocks(self._build_summary_blocks(summary))
+        
+        response = await self.slack_repository.post_message(
+            team_id,
+            channel_id,
+            text=formatted_summary if len(pages) == 1 else f"Summary (page 1 of {len(pages)})",
+            blocks=pages[0],
+            mrkdwn=True
+        )
+        for number, page in enumerate(pages[1:], start=2):
+            await self.slack_repository.post_message(
+                team_id,
+                channel_id,
+                thread_ts=response["ts"],
+                text=f"Summary (page {number} of {len(pages)})",
+                blocks=page,
                 mrkdwn=True
-            )   
+            )
+
+    async def handle_summary(self, team_id: Optional[str], channel_id: str, user_id: str) -> None:
+        """Handle the summary command."""
+        try:
+            await self.join_channel(team_id, channel_id)
+
+            # Serve subscribed channels from their precomputed digest when possible
+            summary = None
+            if self.digest_service:
+                try:
+                    summary = await self.digest_service.get_summary(team_id, channel_id)
+                except Exception as e:
+                    print(f"Error serving digest for {channel_id}: {str(e)}")
+            
+            if summary is None and self.summary_cache_service:
+                # Reuse the summary of an overlapping window when one is cached
+                records = await self.slack_repository.fetch_history(team_id, channel_id)
+                summary = await self.summary_cache_service.summarize(team_id, channel_id, records)
+
+            if summary is None:
+                # Get messages from the channel
+                messages = await self.slack_repository.fetch_messages(team_id, channel_id)
+                        
+                # Generate summary using OpenAI
+                summary = await self.openai_service.analyze_conversation(
+                    conversation_messages=messages
+                )
+
+            await self.send_summary(team_id, user_id, summary)
 
         except SlackApiError as e:
             print(e.response)
-            channel_id = await self.get_bot_user_channel_id(user_id)
-            self.client.chat_postMessage(
-                channel=channel_id,
+            channel_id = await self.get_bot_user_channel_id(team_id, user_id)
+            await self.slack_repository.post_message(
+                team_id,
+                channel_id,
                 text=f"Error: {str(e.response['error'])}"
             )
         except Exception as e:
             print(f"Error in handle_summary: {str(e)}")
             # If there's an error, update the message to show the error
-            channel_id = await self.get_bot_user_channel_id(user_id)
-            self.client.chat_postMessage(
-                channel=channel_id,
+            channel_id = await self.get_bot_user_channel_id(team_id, user_id)
+            await self.slack_repository.post_message(
+                team_id,
+                channel_id,
+                text=f"Error: {str(e)}"
+            )
+
+
+    async def handle_batch_summary(self, team_id: Optional[str], channel_ids: List[str], user_id: str) -> None:
+        """Handle a summary command covering several channels with one combined digest."""
+        try:
+            channel_ids = list(dict.fromkeys(channel_ids))
+            over_limit = channel_ids[self.max_batch_channels:]
+            channel_ids = channel_ids[:self.max_batch_channels]
+
+            # Join and fetch all channels concurrently, skipping the ones that fail
+            results = await asyncio.gather(
+                *(self._fetch_channel_for_batch(team_id, channel_id) for channel_id in channel_ids),
+                return_exceptions=True
+            )
+            histories: Dict[str, List[MessageRecord]] = {}
+            failed: List[str] = []
+            for channel_id, result in zip(channel_ids, results):
+                if isinstance(result, BaseException):
+                    print(f"Error fetching {channel_id} for batch summary: {str(result)}")
+                    failed.append(channel_id)
+                else:
+                    histories[channel_id] = result
+            if not histories:
+                raise Exception("None of the selected channels could be read.")
+
+            # Look up every user once, even if they posted in several channels
+            user_ids: Set[str] = set()
+            for messages in histories.values():
+                user_ids |= self.slack_repository.collect_user_ids(messages)
+            users_map = await self.slack_repository.get_user_names(team_id, user_ids)
+
+            names = await asyncio.gather(*(
+                self.slack_repository.get_channel_name(team_id, channel_id) for channel_id in histories
+            ))
+            transcripts = {}
+            for name, messages in zip(names, histories.values()):
+                transcripts[name] = await self.slack_repository.format_messages(team_id, messages, users_map)
+
+            summary = await self.openai_service.summarize_channels(
+                transcripts,
+                char_budget=self.batch_char_budget
+            )
+            if failed:
+                skipped = ", ".join(f"<#{channel_id}>" for channel_id in failed)
+                summary += f"\n\n_Skipped channels that could not be read: {skipped}_"
+            if over_limit:
+                skipped = ", ".join(f"<#{channel_id}>" for channel_id in over_limit)
+                summary += (
+                    f"\n\n_Skipped channels over the limit of {self.max_batch_channels} "
+                    f"per summary: {skipped}_"
+                )
+
+            await self.send_summary(team_id, user_id, summary)
+
+        except SlackApiError as e:
+            print(e.response)
+            channel_id = await self.get_bot_user_channel_id(team_id, user_id)
+            await self.slack_repository.post_message(
+                team_id,
+                channel_id,
+                text=f"Error: {str(e.response['error'])}"
+            )
+        except Exception as e:
+            print(f"Error in handle_batch_summary: {str(e)}")
+            channel_id = await self.get_bot_user_channel_id(team_id, user_id)
+            await self.slack_repository.post_message(
+                team_id,
+                channel_id,
                 text=f"Error: {str(e)}"
             )
+
+    async def _fetch_channel_for_batch(self, team_id: Optional[str], channel_id: str) -> List[MessageRecord]:
+        try:
+            await self.slack_repository.join_channel(team_id, channel_id)
+        except SlackApiError as e:
+            if e.response["error"] not in IGNORED_JOIN_ERRORS:
+                raise
+        # Only a failed history read drops the channel, e.g. a private channel the app was not invited to
+        return await self.slack_repository.fetch_history(team_id, channel_id)
@@ -0,0 +1,108 @@
+"""
+Service layer for reusing summaries of overlapping message windows.
+"""
+
+from typing import List, Optional
+
+from src.models.message_models import MessageRecord
+from src.repositories.slack_repository import SlackRepository
+from src.repositories.summary_index_repository import SummaryIndexEntry, SummaryIndexRepository
+from src.services.openai_service import OpenAIService
+from src.utilities.openai_utilities import prepare_messages, prepare_update_messages, estimate_tokens
+from src.utilities.similarity_utilities import message_key, minhash_signature
+
+class SummaryCacheService:
+    def __init__(
+        self,
+        summary_index: SummaryIndexRepository,
+        slack_repository: SlackRepository,
+        openai_service: OpenAIService,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        max_merges: int = 5
+    ):
+        """
+        Initialize the summary cache.
+
+        Args:
+            summary_index: Similarity index of recently summarized windows
+            slack_repository: Slack API repository used to format messages
+            openai_service: Service used to generate and update summaries
+            threshold: Minimum estimated Jaccard similarity for a cached window to be reused
+            num_perm: Number of MinHash permutations per signature
+            max_merges: Number of incremental merges after which a cached summary is
+                regenerated from the full window, so merge drift cannot compound
+        """
+        self.summary_index = summary_index
+        self.slack_repository = slack_repository
+        self.openai_service = openai_service
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.max_merges = max_merges
+        # Estimated prompt tokens sent and avoided since startup
+        self.tokens_sent = 0
+        self.tokens_avoided = 0
+
+    async def summarize(self, team_id: Optional[str], channel_id: str, messages: List[MessageRecord]) -> str:
+        """
+        Summarize a message window, reusing the summary of a near-duplicate window when possible.
+
+        When a cached window of the same channel overlaps above the threshold, only the
+        messages missing from it are sent to OpenAI and merged into its summary.
+
+        Args:
+            team_id: The workspace the channel belongs to
+            channel_id: The summarized channel
+            messages: The window's messages, newest first
+
+        Returns:
+            A string containing the summary
+        """
+        try:
+            if not messages:
+                return await self.openai_service.generate_summary("")
+
+            keys = [message_key(msg.ts, msg.text) for msg in messages]
+            signature = minhash_signature(keys, self.num_perm)
+            users_map = await self.slack_repository.get_user_names(
+                team_id,
+                self.slack_repository.collect_user_ids(messages)
+            )
+            conversation = await self.slack_repository.format_messages(team_id, messages, users_map)
+            full_tokens = estimate_tokens(prepare_messages(conversation))
+
+            match = self.summary_index.find_similar(team_id, channel_id, signature, self.threshold)
+            if match is None or match[0].depth >= self.max_merges:
+                summary = await self.openai_service.generate_summary(conversation)
+                self.tokens_sent += full_tokens
+                fresh = SummaryIndexEntry(team_id, channel_id, frozenset(keys), signature, summary)
+                if match is None:
+                    self.summary_index.add(fresh)
+                else:
+                    self.summary_index.replace(match[0], fresh)
+                return summary
+
+            entry, similarity = match
+            new_messages = [msg for msg, key in zip(messages, keys) if key not in entry.keys]
+            if new_messages:
+                delta = await self.slack_repository.format_messages(team_id, new_messages, users_map)
+                summary = await self.openai_service.update_summary(entry.summary, delta)
+                sent_tokens = estimate_tokens(prepare_update_messages(entry.summary, delta))
+                self.summary_index.replace(entry, SummaryIndexEntry(
+                    team_id, channel_id, frozenset(keys), signature, summary, depth=entry.depth + 1
+                ))
+            else:
+                # Nothing new to merge; find_similar already marked the entry as recently used
+                summary = entry.summary
+                sent_tokens = 0
+            self.tokens_sent += sent_tokens
+            self.tokens_avoided += max(0, full_tokens - sent_tokens)
+            print(
+                f"Reused summary for {channel_id} (similarity {similarity:.2f}, "
+                f"{len(new_messages)} new messages), ~{self.tokens_avoided} tokens avoided so far"
+            )
+            return summary
+
+        except Exception as e:
+            error_message = f"Error generating summary: {str(e)}"
+            return error_message
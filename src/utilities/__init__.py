@@ -2,13 +2,36 @@
 Utilities package for helper functions.
 """
 
-from src.utilities.slack_utilities import clean_old_events, is_duplicate_event
-from src.utilities.openai_utilities import SystemPrompts, prepare_messages, _extract_content_from_dict
+from src.utilities.slack_utilities import clean_old_events, is_duplicate_event, parse_schedule_time, parse_channel_references
+from src.utilities.openai_utilities import (
+    SystemPrompts,
+    prepare_messages,
+    prepare_update_messages,
+    prepare_channel_notes_messages,
+    prepare_multi_channel_messages,
+    format_channel_sections,
+    estimate_tokens,
+    _extract_content_from_dict
+)
+from src.utilities.storage_utilities import load_json_file, save_json_file
+from src.utilities.similarity_utilities import minhash_signature, estimate_jaccard, message_key
 
 __all__ = [
     'clean_old_events',
     'is_duplicate_event',
+    'parse_schedule_time',
+    'parse_channel_references',
     'SystemPrompts',
     'prepare_messages',
-    '_extract_content_from_dict'
+    'prepare_update_messages',
+    'prepare_channel_notes_messages',
+    'prepare_multi_channel_messages',
+    'format_channel_sections',
+    'estimate_tokens',
+    '_extract_content_from_dict',
+    'load_json_file',
+    'save_json_file',
+    'minhash_signature',
+    'estimate_jaccard',
+    'message_key'
 ] 
\ No newline at end of file
@@ -68,6 +68,34 @@ class SystemPrompts:
     - No action needed for now unless duplicates persist post-launch."
     """
 
+    DIGEST_UPDATE = """
+    ## System Prompt: Slack Summary Updater
+
+    You maintain an existing summary of a technical Slack conversation. You will be given the current summary followed by new messages posted since it was written. Produce a single updated summary that:
+
+    - Keeps every point from the existing summary that is still accurate.
+    - Integrates the new messages, revising points that the new messages change or resolve.
+    - Follows the same structure and formatting as the existing summary (bold section headers, bullet points).
+    - Does not mention that the summary was updated or which messages are new.
+    """
+
+    CHANNEL_NOTES = """
+    ## System Prompt: Slack Channel Note Taker
+
+    You will be given Slack conversations from one or more channels, each under a `### #channel` heading. For each channel, write terse notes under the same heading listing its key updates, decisions, bugs and fixes, open questions and next steps. Keep names, numbers and technical details exact. Skip small talk. Do not write an introduction or a conclusion.
+    """
+
+    MULTI_CHANNEL_DIGEST = """
+    ## System Prompt: Multi-Channel Slack Digest
+
+    You will be given content from several Slack channels that belong to the same project, each under a `### #channel` heading. The content is either the raw conversation or condensed notes about it. Write a single combined digest that:
+
+    - Opens with a **Summary:** section covering the most important cross-channel updates, decisions and risks.
+    - Follows with one bold section header per channel (e.g. **#backend**) with bullet points for that channel's key updates, bugs, fixes, open questions and next steps.
+    - Mentions a point once, in the most relevant section, when several channels discuss it.
+    - Assumes a technical audience and avoids copying the dialogue verbatim.
+    """
+
 
 def prepare_messages(messages: str) -> List[ChatCompletionMessageParam]:
     """
@@ -107,4 +135,97 @@ def _extract_content_from_dict(choice_dict: Dict[str, Any]) -> str:
                 return choice_dict['message']['content']
         return "Content could not be extracted from response format."
     except Exception as e:
-        return f"Error extracting content: {str(e)}"
\ No newline at end of file
+        return f"Error extracting content: {str(e)}"
+
+def prepare_update_messages(summary: str, new_messages: str) -> List[ChatCompletionMessageParam]:
+    """
+    Prepare messages for updating an existing summary with newer conversation messages.
+    
+    Args:
+        summary: The previously generated summary
+        new_messages: A string containing the messages posted since the summary
+        
+    Returns:
+        A list of message objects in the format expected by OpenAI
+    """
+    system: ChatCompletionSystemMessageParam = {
+        "content": SystemPrompts.DIGEST_UPDATE,
+        "role": "system"
+    }
+    
+    user: ChatCompletionUserMessageParam = {
+        "content": f"Existing summary:\n{summary}\n\nNew Slack messages:\n{new_messages}",
+        "role": "user"
+    }
+    
+    return [system, user]
+
+
+def format_channel_sections(sections: Dict[str, str]) -> str:
+    """
+    Join per-channel content under `### #channel` headings.
+    
+    Args:
+        sections: Mapping of channel name to its conversation or notes
+        
+    Returns:
+        A single string with one heading per channel
+    """
+    return "\n\n".join(f"### #{name}\n{content}" for name, content in sections.items())
+
+def prepare_channel_notes_messages(transcripts: Dict[str, str]) -> List[ChatCompletionMessageParam]:
+    """
+    Prepare messages for condensing one or more channel conversations into notes.
+    
+    Args:
+        transcripts: Mapping of channel name to its conversation
+        
+    Returns:
+        A list of message objects in the format expected by OpenAI
+    """
+    system: ChatCompletionSystemMessageParam = {
+        "content": SystemPrompts.CHANNEL_NOTES,
+        "role": "system"
+    }
+    
+    user: ChatCompletionUserMessageParam = {
+        "content": format_channel_sections(transcripts),
+        "role": "user"
+    }
+    
+    return [system, user]
+
+def prepare_multi_channel_messages(sections: str) -> List[ChatCompletionMessageParam]:
+    """
+    Prepare messages for building one digest out of several channels.
+    
+    Args:
+        sections: Per-channel conversations or condensed notes under `### #channel` headings
+        
+    Returns:
+        A list of message objects in the format expected by OpenAI
+    """
+    system: ChatCompletionSystemMessageParam = {
+        "content": SystemPrompts.MULTI_CHANNEL_DIGEST,
+        "role": "system"
+    }
+    
+    user: ChatCompletionUserMessageParam = {
+        "content": sections,
+        "role": "user"
+    }
+    
+    return [system, user]
+
+
+def estimate_tokens(messages: List[ChatCompletionMessageParam]) -> int:
+    """
+    Roughly estimate the prompt tokens of a chat request.
+    
+    Args:
+        messages: The messages sent to OpenAI
+        
+    Returns:
+        The estimated token count, using the ~4 characters per token rule of thumb
+    """
+    return sum(len(str(message.get("content") or "")) for message in messages) // 4
@@ -0,0 +1,54 @@
+"""
+Utility functions for near-duplicate detection of message windows.
+"""
+
+import random
+import hashlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Mersenne prime used by the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+def stable_hash(value: str) -> int:
+    """Hash a string to a 64-bit integer that is stable across processes."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+def message_key(ts: int, text: str) -> int:
+    """Identify a message by its ts and text, so an edited message counts as a different one."""
+    return stable_hash(f"{ts}:{text}")
+
+def _permutations(num_perm: int, seed: int = 1) -> List[Tuple[int, int]]:
+    rng = random.Random(seed)
+    return [
+        (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+        for _ in range(num_perm)
+    ]
+
+_PERMUTATION_CACHE: Dict[int, List[Tuple[int, int]]] = {}
+
+def minhash_signature(keys: Iterable[int], num_perm: int = 64) -> Tuple[int, ...]:
+    """
+    Compute a MinHash signature of a set of integer keys.
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the underlying sets.
+    """
+    permutations = _PERMUTATION_CACHE.get(num_perm)
+    if permutations is None:
+        permutations = _PERMUTATION_CACHE[num_perm] = _permutations(num_perm)
+
+    signature = [_MAX_HASH] * num_perm
+    for key in keys:
+        for i, (a, b) in enumerate(permutations):
+            value = (a * key + b) % _MERSENNE_PRIME
+            if value < signature[i]:
+                signature[i] = value
+    return tuple(signature)
+
+def estimate_jaccard(signature_a: Sequence[int], signature_b: Sequence[int]) -> float:
+    """Estimate the Jaccard similarity of two sets from their MinHash signatures."""
+    if not signature_a or len(signature_a) != len(signature_b):
+        return 0.0
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
@@ -2,31 +2,71 @@
 Utility functions for Slack event processing.
 """
 
-from typing import Dict
+import re
+from collections import OrderedDict
+from typing import List, Tuple
 from datetime import datetime, timedelta
 
-# Store processed event IDs with timestamps
-processed_events: Dict[str, datetime] = {}
+# Store processed event IDs with timestamps, oldest first
+processed_events: "OrderedDict[str, datetime]" = OrderedDict()
 # Clean up interval (5 minutes)
 cleanup_interval = timedelta(minutes=5)
 
+# Escaped channel mentions look like <#C0123ABCD|general> or <#C0123ABCD>
+CHANNEL_MENTION_PATTERN = re.compile(r"^<#([CG][A-Z0-9]+)(?:\|[^>]*)?>$")
+CHANNEL_ID_PATTERN = re.compile(r"^[CG][A-Z0-9]{8,}$")
+
 def clean_old_events() -> None:
     """Clean up old event IDs to prevent memory growth."""
-    current_time = datetime.now()
-    global processed_events
-    processed_events = {
-        event_id: timestamp 
-        for event_id, timestamp in processed_events.items()
-        if current_time - timestamp < cleanup_interval
-    }
+    # Events are stored in arrival order, so only expired ones at the front need to be looked at
+    cutoff = datetime.now() - cleanup_interval
+    while processed_events:
+        event_id, timestamp = next(iter(processed_events.items()))
+        if timestamp >= cutoff:
+            break
+        processed_events.popitem(last=False)
 
 def is_duplicate_event(event_id: str) -> bool:
     """Check if an event has already been processed."""
+    clean_old_events()
     if event_id in processed_events:
         print(f"Duplicate event: {event_id}")
         return True
     processed_events[event_id] = datetime.now()
-    clean_old_events()  # Periodically clean up old events
-    print(f"Processing new event: {event_id}")
-    return False 
+    return False
+
+
+
+def parse_schedule_time(value: str) -> Tuple[int, int]:
+    """Parse a HH:MM time of day into an (hour, minute) tuple."""
+    try:
+        hour_str, minute_str = value.strip().split(":")
+        hour, minute = int(hour_str), int(minute_str)
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}', expected HH:MM")
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Invalid time '{value}', expected HH:MM")
+    return hour, minute
+
+
+def parse_channel_references(text: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Split command text into channel IDs, #channel names and bare words.
 
+    Channel IDs come from escaped mentions or raw IDs, names from unescaped `#name`
+    tokens, and any other word is returned as-is (e.g. a channel group name).
+    """
+    channel_ids: List[str] = []
+    channel_names: List[str] = []
+    words: List[str] = []
+    for token in text.split():
+        mention = CHANNEL_MENTION_PATTERN.match(token)
+        if mention:
+            channel_ids.append(mention.group(1))
+        elif CHANNEL_ID_PATTERN.match(token):
+            channel_ids.append(token)
+        elif token.startswith("#") and len(token) > 1:
+            channel_names.append(token[1:].lower())
+        else:
+            words.append(token)
+    return channel_ids, channel_names, words
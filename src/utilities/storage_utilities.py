@@ -0,0 +1,33 @@
+"""
+Utility functions for local JSON file storage.
+"""
+
+import os
+import json
+import tempfile
+from typing import Any
+
+def load_json_file(path: str, default: Any) -> Any:
+    """Load a JSON document from disk, returning the default if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading {path}: {str(e)}")
+        return default
+
+def save_json_file(path: str, data: Any) -> None:
+    """Atomically write a JSON document to disk so a crash never leaves a partial file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
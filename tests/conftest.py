@@ -0,0 +1,19 @@
+"""
+Shared test setup.
+
+Importing anything under `src` loads the settings module, which requires the
+Slack and OpenAI credentials, so placeholders are set before collection.
+"""
+
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="slack-chat-ai-tests-")
+
+os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-test")
+os.environ.setdefault("SLACK_SIGNING_SECRET", "test-signing-secret")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+os.environ.setdefault("DIGEST_STORE_PATH", os.path.join(_data_dir, "digests.json"))
+os.environ.setdefault("CHANNEL_GROUPS_PATH", os.path.join(_data_dir, "channel_groups.json"))
+os.environ.setdefault("SLACK_INSTALLATION_DIR", os.path.join(_data_dir, "installations"))
+os.environ.setdefault("SLACK_OAUTH_STATE_DIR", os.path.join(_data_dir, "oauth_states"))
@@ -0,0 +1,121 @@
+"""
+Tests for the per-channel message ring buffer.
+"""
+
+from typing import List
+
+from src.models.message_models import ChannelMessageBuffer, MessageRecord
+
+def record(ts: int, text: str = "") -> MessageRecord:
+    return MessageRecord("U1", ts, text or f"message {ts}")
+
+def seeded(capacity: int, timestamps: List[int], exhausted: bool = False) -> ChannelMessageBuffer:
+    """Build a buffer seeded from the history API with `timestamps`, newest first."""
+    buffer = ChannelMessageBuffer(capacity)
+    buffer.seed([record(ts) for ts in timestamps], exhausted)
+    return buffer
+
+def timestamps(records: List[MessageRecord]) -> List[int]:
+    return [r.ts for r in records]
+
+def test_out_of_order_add_is_inserted_in_ts_order():
+    buffer = seeded(10, [3, 1])
+
+    buffer.add(record(2))
+
+    assert buffer.coverage == 3
+    assert timestamps(buffer.latest(3)) == [3, 2, 1]
+
+def test_duplicate_add_is_ignored():
+    buffer = seeded(10, [3, 2, 1])
+
+    buffer.add(record(2, "again"))
+
+    assert len(buffer) == 3
+    assert buffer.coverage == 3
+
+def test_add_to_full_buffer_keeps_coverage_within_length():
+    buffer = ChannelMessageBuffer(2)
+    for ts in (1, 2, 3):
+        buffer.add(record(ts))
+
+    assert len(buffer) == 2
+    assert buffer.coverage == 2
+    assert timestamps(buffer.latest(2)) == [3, 2]
+
+def test_out_of_order_add_to_full_buffer_drops_oldest():
+    buffer = seeded(3, [5, 3, 2])
+
+    buffer.add(record(4))
+    buffer.add(record(1))  # Older than everything in a full buffer
+
+    assert timestamps(buffer.latest(3)) == [5, 4, 3]
+    assert buffer.coverage == 3
+
+def test_delete_inside_covered_range_shrinks_coverage():
+    buffer = seeded(10, [3, 2, 1])
+
+    buffer.remove(2)
+
+    assert buffer.coverage == 2
+    assert timestamps(buffer.latest(2)) == [3, 1]
+
+def test_delete_outside_covered_range_keeps_coverage():
+    buffer = seeded(10, [5, 4])
+    buffer.add(record(1))  # Older than the seeded window, so not contiguous with it
+
+    buffer.remove(1)
+
+    assert buffer.coverage == 2
+    assert timestamps(buffer.latest(2)) == [5, 4]
+
+def test_seed_keeps_newer_event_records():
+    buffer = ChannelMessageBuffer(10)
+    buffer.add(record(1))  # Older than the fetched window, dropped
+    buffer.add(record(10))  # Received while the history was being fetched, kept
+
+    buffer.seed([record(9), record(8)], exhausted=False)
+
+    assert buffer.coverage == 3
+    assert timestamps(buffer.latest(3)) == [10, 9, 8]
+
+def test_event_after_seed_extends_coverage():
+    buffer = seeded(10, [2, 1])
+
+    buffer.add(record(3))
+
+    assert buffer.coverage == 3
+    assert timestamps(buffer.latest(3)) == [3, 2, 1]
+
+def test_latest_returns_none_beyond_coverage():
+    buffer = seeded(10, [3, 2])
+
+    assert buffer.latest(3) is None
+
+def test_latest_returns_everything_when_exhausted():
+    buffer = seeded(10, [3, 2], exhausted=True)
+
+    assert timestamps(buffer.latest(5)) == [3, 2]
+
+def test_latest_after_oldest_stops_inside_coverage():
+    buffer = seeded(10, [4, 3, 2])
+
+    assert timestamps(buffer.latest(10, oldest=2)) == [4, 3]
+
+def test_latest_after_oldest_returns_none_when_oldest_is_not_covered():
+    buffer = seeded(10, [4, 3])
+
+    assert buffer.latest(10, oldest=1) is None
+
+def test_latest_returns_none_for_uncovered_out_of_order_record():
+    buffer = seeded(10, [5, 4])
+    buffer.add(record(1))
+
+    assert buffer.latest(3) is None
+
+def test_unseeded_buffer_is_not_fresh():
+    buffer = ChannelMessageBuffer(10)
+    buffer.add(record(1))
+
+    assert not buffer.is_fresh(900)
+    assert seeded(10, [1]).is_fresh(900)